@@ -0,0 +1,40 @@
+"""Inti analitik survei Threeasure, tanpa Streamlit.
+
+Alur data: load → clean → derive → select_fomo → aggregate.
+
+- load: baca CSV per blok (tanpa kolom PII) + petakan nama kolom ke peran (muat, skema)
+- clean: nominal rupiah, skor Likert, fakultas, timestamp, jawaban teks Ya/Tidak & FOMO
+  lewat tabel JAWABAN (bersih, skema)
+- derive: proporsi FOMO, skor FOMO, skor kesejahteraan per blok (turunan)
+- select_fomo: sekali pada frame gabungan, pilih skor FOMO teks vs angka dan buang kolom
+  sementaranya (turunan.pilih_fomo)
+- aggregate: kubus OLAP ringkasan per versi data (agregasi)
+
+Selain CSV, survei bisa disimpan per gelombang di basis data SQLite (basisdata), yang
+juga dibaca load_df dan bisa meringkas langsung di SQL tanpa memuat seluruh tabel.
+
+build_from_csv/load_df menjalankan seluruh alur beserta cache Feather; korelasi,
+filter_silang, dan insight bekerja di atas hasilnya. Dashboard (eda.py) dan ekspor
+laporan (laporan.py) hanya lapisan tampilan di atas paket ini. clean, derive, dan
+select_fomo mengembalikan frame baru tanpa mengubah inputnya.
+"""
+
+from .agregasi import ringkas as aggregate
+from .bersih import clean, memory_report
+from .muat import DATA_PATH, build_from_csv, load, load_df, source_fingerprint
+from .skema import KolomTidakDikenali
+from .turunan import derive, pilih_fomo as select_fomo
+
+__all__ = [
+    "DATA_PATH",
+    "KolomTidakDikenali",
+    "aggregate",
+    "build_from_csv",
+    "clean",
+    "derive",
+    "load",
+    "load_df",
+    "memory_report",
+    "select_fomo",
+    "source_fingerprint",
+]
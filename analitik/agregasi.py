@@ -0,0 +1,258 @@
+# agregasi.py
+# Binning ukuran Likert sekali + kubus OLAP (jumlah & total per sel) dari np.bincount
+
+import numpy as np
+import pandas as pd
+
+# Satu definisi bin untuk setiap ukuran, dipakai semua tab (interval kanan-tertutup seperti pd.cut)
+SKALA_5 = [0, 1.5, 2.5, 3.5, 4.5, 5.5]
+
+BINNING = {
+    "fomo": {
+        "kolom": "fomo_num",
+        "bins": SKALA_5,
+        "labels": ["Tidak Pernah", "Jarang", "Kadang-kadang", "Sering", "Sangat Sering"],
+    },
+    "kemampuan": {
+        "kolom": "kemampuan_num",
+        "bins": SKALA_5,
+        "labels": ["Buruk", "Kurang Baik", "Cukup Baik", "Baik", "Sangat Baik"],
+    },
+    "kesejahteraan": {
+        "kolom": "kesejahteraan_score",
+        "bins": [0, 2.5, 3.5, 5.5],
+        "labels": ["Buruk", "Cukup Baik", "Baik"],
+    },
+    "proporsi": {
+        "kolom": "proporsi_fomo_pct",
+        "bins": [0, 20, 50, 100],
+        "labels": ["Rendah (<20%)", "Sedang (20–50%)", "Tinggi (>50%)"],
+        "include_lowest": True,
+    },
+}
+
+
+def bin_codes(values, bins, include_lowest=False):
+    """Kode bin int8 untuk setiap nilai; -1 untuk NaN atau di luar rentang.
+
+    Setara dengan pd.cut(values, bins, labels=False) tetapi tanpa membuat
+    Categorical per pemanggilan.
+    """
+    x = np.asarray(values, dtype="float64")
+    codes = np.searchsorted(np.asarray(bins, dtype="float64"), x, side="left") - 1
+    if include_lowest:
+        codes[x == bins[0]] = 0
+    codes[(codes < 0) | (codes >= len(bins) - 1) | np.isnan(x)] = -1
+    return codes.astype("int8")
+
+
+def bin_measures(df_work):
+    """Kode bin untuk setiap ukuran di BINNING yang kolomnya tersedia."""
+    return {
+        nama: bin_codes(df_work[spec["kolom"]], spec["bins"], spec.get("include_lowest", False))
+        for nama, spec in BINNING.items()
+        if spec["kolom"] in df_work.columns
+    }
+
+
+def lebar_bin_rapi(rentang, nbins):
+    """Lebar bin 1/2/5 × 10^k terkecil sehingga rentang terbagi paling banyak nbins bin."""
+    if not rentang > 0:
+        return 1.0
+    mentah = rentang / nbins
+    dasar = 10 ** np.floor(np.log10(mentah))
+    return float(next(dasar * m for m in (1, 2, 5, 10) if dasar * m >= mentah))
+
+
+def histogram(values, nbins=20):
+    """(jumlah per bin, tepi bin) untuk nilai numerik, NaN diabaikan; None jika kosong.
+
+    Tepi bin dibulatkan ke kelipatan lebar rapi seperti autobin histogram Plotly
+    (nbinsx), sehingga grafik cukup menerima O(bin) angka, bukan seluruh baris.
+    """
+    x = np.asarray(values, dtype="float64")
+    x = x[np.isfinite(x)]
+    if len(x) == 0:
+        return None
+    lo, hi = x.min(), x.max()
+    lebar = lebar_bin_rapi(hi - lo, nbins)
+    awal = np.floor(lo / lebar) * lebar
+    n = max(int(np.ceil((hi - awal) / lebar)), 1)
+    # Nilai yang tepat di tepi kanan terakhir masuk bin baru, seperti bin Plotly [a, b)
+    if awal + n * lebar <= hi:
+        n += 1
+    tepi = awal + lebar * np.arange(n + 1)
+    jumlah = np.bincount(np.minimum(((x - awal) // lebar).astype(np.int64), n - 1), minlength=n)
+    return jumlah, tepi
+
+
+def long_form(cross):
+    """Data bar bentuk panjang (kolom a_cat, b_cat, Jumlah) dari matriks kontingensi."""
+    comb = cross.stack().rename("Jumlah").reset_index()
+    return comb[comb["Jumlah"] > 0].reset_index(drop=True)
+
+
+# ---------------------------
+# Kubus OLAP (KPI + tabel kontingensi)
+# ---------------------------
+# Satu kubus padat per versi data: untuk setiap kombinasi fakultas × FOMO × kemampuan ×
+# kesejahteraan × proporsi disimpan jumlah responden, serta jumlah nilai & cacah terisi
+# kolom KPI. Setiap dimensi punya satu slot ekstra (indeks terakhir) untuk nilai kosong.
+# KPI, frekuensi, dan tabel kontingensi dijawab dengan menjumlahkan sumbu kubus, sehingga
+# biayanya tidak bergantung pada jumlah responden. Semua isinya aditif, sehingga kubus
+# baris baru cukup ditambahkan ke kubus lama tanpa memindai ulang seluruh data.
+KOLOM_KPI = ["uang_saku_num", "pengeluaran_fomo_num", "kemampuan_num", "kesejahteraan_score", "proporsi_fomo_pct"]
+KOLOM_FAKULTAS = "fakultas_clean"
+DIMENSI_KUBUS = ("fakultas", "fomo", "kemampuan", "kesejahteraan", "proporsi")
+
+
+def basis_ringkasan(df_work):
+    """Kode per dimensi kubus dan nilai KPI (float64) seluruh baris, sekali per versi data.
+
+    Dengan basis ini kubus subset (filter) cukup memilih elemen array lewat mask,
+    tanpa memindai atau menyalin df_work.
+    """
+    n = len(df_work)
+    codes = bin_measures(df_work)
+    label = {nama: BINNING[nama]["labels"] for nama in BINNING}
+    if KOLOM_FAKULTAS in df_work.columns:
+        kode, nilai = pd.factorize(df_work[KOLOM_FAKULTAS], sort=True)
+        codes["fakultas"], label["fakultas"] = kode, [str(v) for v in nilai]
+    for nama in DIMENSI_KUBUS:
+        if nama not in codes:
+            codes[nama] = np.full(n, -1, dtype="int8")
+            label.setdefault(nama, [])
+    kpi = [c for c in KOLOM_KPI if c in df_work.columns]
+    return {
+        "n": n,
+        "codes": codes,
+        "label": {nama: label[nama] for nama in DIMENSI_KUBUS},
+        # Akumulasi float64 walau kolomnya float32, supaya rata-rata tidak kehilangan presisi
+        "nilai": {c: df_work[c].to_numpy(dtype="float64", na_value=np.nan) for c in kpi},
+    }
+
+
+def _ukuran(label):
+    return tuple(len(label[d]) + 1 for d in DIMENSI_KUBUS)
+
+
+def ringkas_basis(basis, mask=None):
+    """Kubus baris yang lolos mask (semua baris jika mask None), dari beberapa np.bincount."""
+    pilih = (lambda a: a) if mask is None else (lambda a: a[mask])
+    ukuran = _ukuran(basis["label"])
+    sel = None
+    for d, n in zip(DIMENSI_KUBUS, ukuran):
+        c = pilih(basis["codes"][d]).astype("int64")
+        c = np.where(c < 0, n - 1, c)
+        sel = c if sel is None else sel * n + c
+    m = int(np.prod(ukuran))
+
+    jumlah, terisi = {}, {}
+    for c, v in basis["nilai"].items():
+        v = pilih(v)
+        valid = ~np.isnan(v)
+        jumlah[c] = np.bincount(sel[valid], weights=v[valid], minlength=m).reshape(ukuran).tolist()
+        terisi[c] = np.bincount(sel[valid], minlength=m).reshape(ukuran).tolist()
+    return {
+        "n": len(sel),
+        "label": basis["label"],
+        "sel": np.bincount(sel, minlength=m).reshape(ukuran).tolist(),
+        "jumlah": jumlah,
+        "terisi": terisi,
+    }
+
+
+def ringkas(df_work):
+    """Kubus satu frame: jumlah responden per sel, jumlah & cacah terisi kolom KPI per sel."""
+    return ringkas_basis(basis_ringkasan(df_work))
+
+
+def _selaraskan(arr, label_lama, label):
+    # Tempatkan sel kubus berlabel lama ke posisinya pada label gabungan (slot kosong tetap terakhir)
+    arr = np.asarray(arr)
+    for ax, d in enumerate(DIMENSI_KUBUS):
+        if label_lama[d] == label[d]:
+            continue
+        posisi = [label[d].index(v) for v in label_lama[d]] + [len(label[d])]
+        shape = list(arr.shape)
+        shape[ax] = len(label[d]) + 1
+        hasil = np.zeros(shape, dtype=arr.dtype)
+        hasil[(slice(None),) * ax + (posisi,)] = arr
+        arr = hasil
+    return arr
+
+
+def tambah_ringkasan(total, baru):
+    """Tambahkan kubus `baru` ke `total` (in place) dan kembalikan `total`.
+
+    Label fakultas yang baru muncul ditambahkan di belakang, sel lama tidak bergeser.
+    """
+    label = {d: total["label"][d] + [v for v in baru["label"][d] if v not in total["label"][d]]
+             for d in DIMENSI_KUBUS}
+    gabung = lambda a, b: (_selaraskan(a, total["label"], label) + _selaraskan(b, baru["label"], label)).tolist()
+    total["sel"] = gabung(total["sel"], baru["sel"])
+    for kunci in ("jumlah", "terisi"):
+        for c, v in baru[kunci].items():
+            lama = total[kunci].get(c, np.zeros(_ukuran(total["label"]), dtype=np.asarray(v).dtype))
+            total[kunci][c] = gabung(lama, v)
+    total["n"] += baru["n"]
+    total["label"] = label
+    return total
+
+
+def iris(ringkasan, **pilih):
+    """Sub-kubus untuk nilai terpilih per dimensi (mis. fakultas=[...]); sel lain dinolkan."""
+    ukuran = _ukuran(ringkasan["label"])
+    simpan = np.ones(ukuran, dtype=bool)
+    for ax, d in enumerate(DIMENSI_KUBUS):
+        if d not in pilih:
+            continue
+        v = np.zeros(ukuran[ax], dtype=bool)
+        v[[ringkasan["label"][d].index(x) for x in pilih[d] if x in ringkasan["label"][d]]] = True
+        simpan &= v.reshape([-1 if i == ax else 1 for i in range(len(ukuran))])
+    potong = lambda a: np.where(simpan, np.asarray(a), 0).tolist()
+    sel = np.where(simpan, np.asarray(ringkasan["sel"]), 0)
+    return {
+        "n": int(sel.sum()),
+        "label": ringkasan["label"],
+        "sel": sel.tolist(),
+        "jumlah": {c: potong(a) for c, a in ringkasan["jumlah"].items()},
+        "terisi": {c: potong(a) for c, a in ringkasan["terisi"].items()},
+    }
+
+
+def _marginal(ringkasan, dims):
+    # Jumlah responden per sel, dijumlahkan atas semua dimensi selain dims (urutan kubus)
+    lain = tuple(i for i, d in enumerate(DIMENSI_KUBUS) if d not in dims)
+    return np.asarray(ringkasan["sel"]).sum(axis=lain)
+
+
+def rata_rata(ringkasan, kolom):
+    """Rata-rata kolom KPI dari kubus; NaN jika tidak ada nilai terisi."""
+    if kolom not in ringkasan["terisi"]:
+        return np.nan
+    terisi = np.sum(ringkasan["terisi"][kolom])
+    return float(np.sum(ringkasan["jumlah"][kolom]) / terisi) if terisi else np.nan
+
+
+def frekuensi(ringkasan, nama):
+    """Frekuensi per label satu dimensi sebagai Series (setara value_counts, tanpa nilai kosong)."""
+    return pd.Series(_marginal(ringkasan, (nama,))[:-1], index=ringkasan["label"][nama])
+
+
+def contingency(ringkasan, a, b):
+    """Matriks a × b (seperti pd.crosstab) dari kubus.
+
+    Baris/kolom yang seluruhnya nol dibuang, sama dengan perilaku pd.crosstab.
+    """
+    m = _marginal(ringkasan, (a, b))
+    if DIMENSI_KUBUS.index(a) > DIMENSI_KUBUS.index(b):
+        m = m.T
+    m = m[:-1, :-1]  # buang slot nilai kosong
+
+    cross = pd.DataFrame(
+        m,
+        index=pd.CategoricalIndex(ringkasan["label"][a], name=f"{a}_cat"),
+        columns=pd.CategoricalIndex(ringkasan["label"][b], name=f"{b}_cat"),
+    )
+    return cross.loc[m.sum(axis=1) > 0, m.sum(axis=0) > 0]
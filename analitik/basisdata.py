@@ -0,0 +1,337 @@
+# basisdata.py
+# Sumber data SQLite: impor gelombang survei, pool koneksi baca-saja, agregasi di SQL
+#
+# Setiap gelombang survei (CSV) dijalankan lewat load → clean → derive yang sama dengan
+# sumber CSV, lalu barisnya ditambahkan ke tabel `respons` beserta kolom `gelombang`.
+# Proses yang tidak perlu memuat seluruh tabel (mis. worker laporan per fakultas) meminta
+# kubus ringkasan (KPI + tabel kontingensi) lewat ringkas_sql: GROUP BY atas ekspresi
+# CASE yang setara bin_codes, sehingga hanya sel kubus yang masuk ke Python. Filter
+# diterjemahkan ke klausa WHERE dengan semantik yang sama dengan mask_filter, dan kolom
+# per baris yang memang dibutuhkan dibaca lewat baca_frame(kolom, syarat).
+
+import contextlib
+import datetime
+import json
+import os
+import pathlib
+import queue
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .agregasi import BINNING, DIMENSI_KUBUS, KOLOM_FAKULTAS, KOLOM_KPI, _ukuran, ringkas
+from .muat import _derive_semua, load
+from .skema import KolomTidakDikenali
+from .turunan import pilih_fomo
+
+TABEL_RESPONS = "respons"
+TABEL_META = "meta"
+KOLOM_GELOMBANG = "gelombang"
+# Kolom yang diberi indeks: filter sidebar yang paling sering dipakai + gelombang
+KOLOM_INDEKS = [KOLOM_FAKULTAS, "waktu", KOLOM_GELOMBANG]
+# Waktu disimpan sebagai teks ISO supaya rentang tanggal cukup dibandingkan sebagai string
+FORMAT_WAKTU_SQL = "%Y-%m-%d %H:%M:%S"
+UKURAN_POOL = 4
+
+
+def _kutip(nama):
+    return '"' + str(nama).replace('"', '""') + '"'
+
+
+# ---------------------------
+# Pool koneksi
+# ---------------------------
+# Koneksi baca-saja (mode=ro) dibuka saat pertama dibutuhkan, paling banyak `ukuran`
+# per file, lalu dipinjam bergantian oleh thread (sesi Streamlit) yang berbeda. Pool
+# dikunci pada identitas file (inode + mtime): bila file diganti (rsync, os.replace)
+# atau ditulis ulang, pool lama ditutup, karena koneksinya tetap membaca inode lama.
+_pool = {}
+_kunci_pool = threading.Lock()
+
+
+def _buka(path):
+    uri = pathlib.Path(path).resolve().as_uri() + "?mode=ro"
+    return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+
+def _tutup(pool):
+    # Koneksi bebas ditutup sekarang; koneksi yang sedang dipinjam ditutup saat dikembalikan
+    pool["ditutup"] = True
+    while True:
+        try:
+            pool["bebas"].get_nowait().close()
+        except queue.Empty:
+            break
+
+
+def pool_sqlite(path, ukuran=UKURAN_POOL):
+    """Pool koneksi untuk versi file SQLite saat ini, satu per proses."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    kunci = (path, stat.st_ino, stat.st_mtime_ns)
+    with _kunci_pool:
+        if kunci not in _pool:
+            for lama in [k for k in _pool if k[0] == path]:
+                _tutup(_pool.pop(lama))
+            _pool[kunci] = {"path": path, "ukuran": ukuran, "dibuka": 0, "ditutup": False,
+                            "bebas": queue.LifoQueue(), "kunci": threading.Lock()}
+        return _pool[kunci]
+
+
+@contextlib.contextmanager
+def pinjam(pool, timeout=30):
+    """Pinjam satu koneksi dari pool; menunggu paling lama timeout detik bila semua dipakai."""
+    try:
+        con = pool["bebas"].get_nowait()
+    except queue.Empty:
+        with pool["kunci"]:
+            baru = pool["dibuka"] < pool["ukuran"]
+            if baru:
+                pool["dibuka"] += 1
+        if baru:
+            try:
+                con = _buka(pool["path"])
+            except sqlite3.Error:
+                with pool["kunci"]:
+                    pool["dibuka"] -= 1
+                raise
+        else:
+            con = pool["bebas"].get(timeout=timeout)
+    try:
+        yield con
+    finally:
+        if pool["ditutup"]:
+            con.close()
+        else:
+            pool["bebas"].put(con)
+
+
+def tutup_pool(path):
+    """Tutup semua pool milik file ini (semua versinya)."""
+    path = os.path.abspath(path)
+    with _kunci_pool:
+        for kunci in [k for k in _pool if k[0] == path]:
+            _tutup(_pool.pop(kunci))
+
+
+def _meta(con):
+    try:
+        baris = con.execute(f"SELECT kunci, nilai FROM {TABEL_META}").fetchall()
+    except sqlite3.OperationalError:
+        return None
+    return {k: json.loads(v) for k, v in baris} or None
+
+
+# ---------------------------
+# Impor gelombang survei
+# ---------------------------
+def _ke_sql(df_work):
+    # Kolom category → teks, boolean → 0/1, waktu → teks ISO (NaT → NULL)
+    df_sql = df_work.copy()
+    for c in df_sql.columns:
+        s = df_sql[c]
+        if pd.api.types.is_datetime64_any_dtype(s):
+            df_sql[c] = s.dt.strftime(FORMAT_WAKTU_SQL).astype(object).where(s.notna(), None)
+        elif isinstance(s.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(s):
+            df_sql[c] = s.astype(object).where(s.notna(), None)
+        elif pd.api.types.is_extension_array_dtype(s):
+            df_sql[c] = s.astype(object).where(s.notna(), None)
+    return df_sql
+
+
+def impor_csv(db_path, csv_path, gelombang=None):
+    """Tambahkan satu gelombang survei (CSV) ke basis data SQLite; kembalikan jumlah baris.
+
+    Gelombang pertama menetapkan peta kolom dan pilihan skor FOMO; gelombang berikutnya
+    harus memakai kolom yang sama dan memakai ulang pilihan itu (seperti append_rows).
+    """
+    chunks, kolom = load(csv_path)
+    con = sqlite3.connect(db_path)
+    try:
+        meta = _meta(con)
+        if meta is not None and meta["kolom"] != kolom:
+            raise KolomTidakDikenali(f"Kolom {csv_path} tidak cocok dengan gelombang di {db_path}")
+        df_work = _derive_semua(chunks, kolom, csv_path)
+        df_work, fomo_angka = pilih_fomo(df_work, None if meta is None else meta["fomo_angka"])
+        if meta is not None and list(df_work.columns) != list(meta["dtype"]):
+            raise KolomTidakDikenali(f"Kolom turunan {csv_path} tidak cocok dengan gelombang di {db_path}")
+        dtype = {c: str(df_work[c].dtype) for c in df_work.columns}
+
+        df_sql = _ke_sql(df_work)
+        df_sql[KOLOM_GELOMBANG] = gelombang or os.path.splitext(os.path.basename(csv_path))[0]
+        with con:
+            df_sql.to_sql(TABEL_RESPONS, con, if_exists="append", index=False)
+            for c in KOLOM_INDEKS:
+                if c in df_sql.columns:
+                    con.execute(f"CREATE INDEX IF NOT EXISTS {_kutip('idx_' + c)} "
+                                f"ON {TABEL_RESPONS} ({_kutip(c)})")
+            con.execute(f"CREATE TABLE IF NOT EXISTS {TABEL_META} (kunci TEXT PRIMARY KEY, nilai TEXT)")
+            con.executemany(f"INSERT OR REPLACE INTO {TABEL_META} VALUES (?, ?)", [
+                ("kolom", json.dumps(kolom)),
+                ("fomo_angka", json.dumps(fomo_angka)),
+                ("dtype", json.dumps(dtype)),
+            ])
+        return len(df_sql)
+    finally:
+        con.close()
+
+
+# ---------------------------
+# Baca & agregasi
+# ---------------------------
+def meta_sqlite(pool):
+    """Metadata basis data: peta kolom (kolom), fomo_angka, dtype per kolom df_work."""
+    with pinjam(pool) as con:
+        meta = _meta(con)
+    if meta is None:
+        raise ValueError(f"{pool['path']} belum berisi gelombang survei (lihat impor_csv)")
+    return meta
+
+
+def klausa_filter(pilihan, kolom_filter, kolom_waktu="waktu"):
+    """(syarat WHERE, parameter) untuk pilihan filter sidebar.
+
+    Semantik sama dengan mask_filter: nilai dalam satu grup digabung OR (IN), antar-grup
+    AND, rentang waktu inklusif per hari. Syarat kosong berarti semua baris.
+    """
+    syarat, params = [], []
+    for nama, dipilih in pilihan.items():
+        if not dipilih:
+            continue
+        if nama == "waktu":
+            awal, akhir = dipilih
+            syarat.append(f"{_kutip(kolom_waktu)} >= ? AND {_kutip(kolom_waktu)} < ?")
+            params += [awal.isoformat(), (akhir + datetime.timedelta(days=1)).isoformat()]
+        elif kolom_filter.get(nama):
+            syarat.append(f"{_kutip(kolom_filter[nama])} IN ({', '.join('?' * len(dipilih))})")
+            params += [str(v) for v in dipilih]
+    return " AND ".join(syarat), tuple(params)
+
+
+def _where(syarat):
+    return f" WHERE {syarat}" if syarat else ""
+
+
+def _kasus_bin(kolom, spec):
+    # Setara bin_codes: interval kanan-tertutup, NULL atau di luar rentang → NULL (slot kosong)
+    bins, q = spec["bins"], _kutip(kolom)
+    cabang = [f"WHEN {q} = {bins[0]!r} THEN 0"] if spec.get("include_lowest") else []
+    cabang += [f"WHEN {q} > {bins[i]!r} AND {q} <= {bins[i + 1]!r} THEN {i}" for i in range(len(bins) - 1)]
+    return f"CASE {' '.join(cabang)} END"
+
+
+def ringkas_sql(pool, syarat="", params=()):
+    """Kubus ringkasan (bentuk sama dengan ringkas_basis) dari satu GROUP BY di SQLite.
+
+    Label fakultas selalu diambil dari seluruh tabel, sehingga kubus subset (WHERE)
+    berbagi sumbu dengan kubus semua baris, sama seperti ringkas_basis dengan mask.
+    """
+    dtype = meta_sqlite(pool)["dtype"]
+    label, dimensi = {}, []
+    with pinjam(pool) as con:
+        if KOLOM_FAKULTAS in dtype:
+            label["fakultas"] = [v for (v,) in con.execute(
+                f"SELECT DISTINCT {_kutip(KOLOM_FAKULTAS)} FROM {TABEL_RESPONS} "
+                f"WHERE {_kutip(KOLOM_FAKULTAS)} IS NOT NULL ORDER BY 1")]
+            dimensi.append(_kutip(KOLOM_FAKULTAS))
+        else:
+            label["fakultas"] = []
+            dimensi.append("NULL")
+        for nama in DIMENSI_KUBUS[1:]:
+            spec = BINNING[nama]
+            label[nama] = spec["labels"] if spec["kolom"] in dtype else []
+            dimensi.append(_kasus_bin(spec["kolom"], spec) if spec["kolom"] in dtype else "NULL")
+        kpi = [c for c in KOLOM_KPI if c in dtype]
+        nilai = "".join(f", SUM({_kutip(c)}), COUNT({_kutip(c)})" for c in kpi)
+        grup = ", ".join(str(i + 1) for i in range(len(dimensi)))
+        baris = con.execute(
+            f"SELECT {', '.join(dimensi)}, COUNT(*){nilai} FROM {TABEL_RESPONS}"
+            f"{_where(syarat)} GROUP BY {grup}", params).fetchall()
+
+    ukuran = _ukuran(label)
+    sel = np.zeros(ukuran, dtype=np.int64)
+    jumlah = {c: np.zeros(ukuran) for c in kpi}
+    terisi = {c: np.zeros(ukuran, dtype=np.int64) for c in kpi}
+    posisi_fakultas = {v: i for i, v in enumerate(label["fakultas"])}
+    k = len(DIMENSI_KUBUS)
+    for b in baris:
+        idx = (posisi_fakultas.get(b[0], ukuran[0] - 1),) + tuple(
+            n - 1 if v is None else v for v, n in zip(b[1:k], ukuran[1:]))
+        sel[idx] = b[k]
+        for i, c in enumerate(kpi):
+            jumlah[c][idx] = b[k + 1 + 2 * i] or 0.0
+            terisi[c][idx] = b[k + 2 + 2 * i]
+    return {
+        "n": int(sel.sum()),
+        "label": label,
+        "sel": sel.tolist(),
+        "jumlah": {c: a.tolist() for c, a in jumlah.items()},
+        "terisi": {c: a.tolist() for c, a in terisi.items()},
+    }
+
+
+def hitung_sql(pool, kolom, syarat="", params=()):
+    """Jumlah baris per nilai satu kolom, setara value_counts pada kolom category.
+
+    Nilai yang ada di tabel tetapi tidak muncul pada subset (syarat) tetap disertakan
+    dengan jumlah 0, terbanyak dulu; nilai kosong tidak dihitung.
+    """
+    q = _kutip(kolom)
+    batas = f"{q} IS NOT NULL" + (f" AND {syarat}" if syarat else "")
+    with pinjam(pool) as con:
+        semua = [v for (v,) in con.execute(
+            f"SELECT DISTINCT {q} FROM {TABEL_RESPONS} WHERE {q} IS NOT NULL ORDER BY 1")]
+        jumlah = dict(con.execute(f"SELECT {q}, COUNT(*) FROM {TABEL_RESPONS} WHERE {batas} GROUP BY 1", params))
+    hasil = pd.Series([jumlah.get(v, 0) for v in semua], index=semua, name="count", dtype="int64")
+    return hasil.sort_values(ascending=False, kind="stable")
+
+
+def baca_frame(pool, kolom=None, syarat="", params=()):
+    """df_work (atau hanya kolom tertentu) dari SQLite, dtype sama dengan jalur CSV.
+
+    Dengan syarat WHERE hanya subset baris yang dibaca, misalnya satu fakultas.
+    """
+    dtype = meta_sqlite(pool)["dtype"]
+    kolom = list(dtype) if kolom is None else [c for c in dict.fromkeys(kolom) if c in dtype]
+    with pinjam(pool) as con:
+        df_work = pd.read_sql_query(
+            f"SELECT {', '.join(_kutip(c) for c in kolom)} FROM {TABEL_RESPONS}"
+            f"{_where(syarat)} ORDER BY rowid", con, params=params)
+    for c in kolom:
+        if dtype[c].startswith("datetime64"):
+            df_work[c] = pd.to_datetime(df_work[c], format=FORMAT_WAKTU_SQL).astype(dtype[c])
+        elif dtype[c] in ("boolean", "UInt8") or dtype[c].startswith("float"):
+            df_work[c] = pd.to_numeric(df_work[c]).astype(dtype[c])
+        else:
+            df_work[c] = df_work[c].astype(dtype[c])
+    return df_work
+
+
+def build_from_sqlite(path):
+    """Seluruh tabel respons sebagai (df_work, info), setara build_from_csv.
+
+    Dipakai proses yang memang menyimpan semua baris (dashboard). Karena barisnya sudah
+    di memori, kubus dihitung dengan np.bincount (ringkas) yang jauh lebih cepat daripada
+    GROUP BY atas seluruh tabel; ringkas_sql untuk pemanggil yang tidak memuat baris.
+    """
+    pool = pool_sqlite(path)
+    meta = meta_sqlite(pool)
+    df_work = baca_frame(pool)
+    return df_work, {"kolom": meta["kolom"], "fomo_angka": meta["fomo_angka"], "ringkasan": ringkas(df_work)}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Impor gelombang survei (CSV) ke basis data SQLite")
+    parser.add_argument("db", help="file SQLite tujuan (dibuat bila belum ada)")
+    parser.add_argument("csv", nargs="+", help="satu file CSV per gelombang")
+    parser.add_argument("--gelombang", nargs="+", help="nama gelombang (bawaan: nama file CSV)")
+    args = parser.parse_args()
+    if args.gelombang and len(args.gelombang) != len(args.csv):
+        parser.error("jumlah --gelombang harus sama dengan jumlah CSV")
+    for i, csv_path in enumerate(args.csv):
+        n = impor_csv(args.db, csv_path, args.gelombang[i] if args.gelombang else None)
+        print(f"{csv_path}: {n} baris")
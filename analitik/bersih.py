@@ -0,0 +1,122 @@
+# bersih.py
+# Tahap clean: jawaban mentah → nilai bertipe (uang, skor, fakultas, waktu, Ya/Tidak)
+
+import numpy as np
+import pandas as pd
+
+from .rupiah import parse_rupiah
+from .skema import FORMAT_WAKTU, JAWABAN, KOLOM_FLOAT
+
+
+def _angka(df_work, col):
+    if col and col in df_work.columns:
+        return pd.to_numeric(df_work[col], errors="coerce")
+    return pd.Series([np.nan] * len(df_work), index=df_work.index)
+
+
+def clean(df_work, kolom):
+    """Normalisasi satu blok mentah dan kembalikan blok baru (input tidak diubah).
+
+    Nominal uang di-parse ke float, skor Likert dijadikan angka, fakultas dirapikan,
+    timestamp di-parse, dan jawaban teks (Ya/Tidak, frekuensi FOMO) dipetakan lewat
+    tabel JAWABAN. Semua operasi per baris, sehingga aman dijalankan per blok. Kolom mentah
+    uang dan timestamp dibuang setelah di-parse; df_work hanya membawa *_num dan waktu.
+    """
+    # Salinan dangkal: kolom baru/ganti hanya masuk ke salinan, data kolom lama tidak disalin
+    df_work = df_work.copy(deep=False)
+    mentah = [kolom[p] for p in ("uang_saku", "pengeluaran_fomo", "timestamp") if kolom[p] in df_work.columns]
+    uang = {p: parse_rupiah(df_work[kolom[p]]) if kolom[p] in df_work.columns else np.nan
+            for p in ("uang_saku", "pengeluaran_fomo")}
+    col_waktu = kolom["timestamp"]
+    if col_waktu and col_waktu in df_work.columns:
+        waktu = pd.to_datetime(df_work[col_waktu], format=FORMAT_WAKTU, errors="coerce")
+    else:
+        waktu = pd.Series(pd.NaT, index=df_work.index, dtype="datetime64[ns]")
+    df_work = df_work.drop(columns=mentah)
+
+    for peran, nilai in uang.items():
+        df_work[f"{peran}_num"] = nilai
+
+    df_work["kemampuan_num"] = _angka(df_work, kolom["kemampuan"])
+    for c in [kolom["distress_1"], kolom["distress_2"], kolom["distress_3"], kolom["distress_4"]]:
+        if c and c in df_work.columns:
+            df_work[c] = pd.to_numeric(df_work[c], errors="coerce")
+
+    col_fakultas = kolom["fakultas"]
+    if col_fakultas and col_fakultas in df_work.columns:
+        df_work["fakultas_clean"] = df_work[col_fakultas].astype(str).str.strip().astype("category")
+    else:
+        df_work["fakultas_clean"] = pd.Categorical(["Unknown"] * len(df_work))
+    df_work["waktu"] = waktu
+
+    return normalisasi_jawaban(df_work, kolom)
+
+
+def _faktor(s):
+    # (kode per baris, nilai unik yang sudah di-strip + huruf kecil); kode -1 = kosong.
+    # Kolom category sudah membawa kode & kategorinya, jadi tidak perlu di-factorize ulang
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        kode, unik = s.cat.codes.to_numpy(), s.cat.categories
+    else:
+        kode, unik = pd.factorize(s)
+    return kode, pd.Index(unik.astype(str)).str.strip().str.lower()
+
+
+def petakan_jawaban(kode, unik, skala, dtype):
+    """Petakan nilai unik lewat skala (dict, atau None untuk angka) lalu sebar lewat kode.
+
+    Biayanya sebanding dengan jumlah jawaban berbeda, bukan jumlah baris: pemetaan
+    berjalan pada nilai unik, dan baris hanya disentuh oleh satu take per kode.
+    """
+    nilai = pd.to_numeric(unik, errors="coerce") if skala is None else unik.map(skala)
+    return pd.array(nilai, dtype=dtype).take(kode, allow_fill=True)
+
+
+def normalisasi_jawaban(df_work, kolom):
+    """Terapkan tabel JAWABAN ke satu blok dan kembalikan blok baru (input tidak diubah)."""
+    df_work = df_work.copy(deep=False)
+    faktor = {}
+    for entri in JAWABAN:
+        c = entri["kolom"] if "kolom" in entri else kolom[entri["peran"]]
+        if not c or c not in df_work.columns:
+            continue
+        if c not in faktor:
+            faktor[c] = _faktor(df_work[c])
+        hasil = petakan_jawaban(*faktor[c], entri["skala"], entri["dtype"])
+        df_work[entri.get("hasil", c)] = pd.Series(hasil, index=df_work.index)
+    return df_work
+
+
+# ---------------------------
+# Skema ringkas df_work
+# ---------------------------
+def _kode_likert(s):
+    # Skor bulat 0–255 (Likert 1–5, skor total, 0/1) muat di UInt8; selain itu float32
+    v = s.dropna()
+    if len(v) == 0 or ((v % 1 == 0).all() and v.between(0, 255).all()):
+        return s.astype("UInt8")
+    return s.astype("float32")
+
+
+def compact(df_work, kolom):
+    """Turunkan kolom numerik ke dtype terkecil yang cukup (float32 / UInt8) pada blok baru."""
+    df_work = df_work.copy(deep=False)
+    for c in df_work.columns:
+        s = df_work[c]
+        if pd.api.types.is_bool_dtype(s) or not pd.api.types.is_numeric_dtype(s):
+            continue
+        elif c in KOLOM_FLOAT:
+            df_work[c] = s.astype("float32")
+        else:
+            df_work[c] = _kode_likert(s)
+    return df_work
+
+
+def memory_report(df):
+    """Pemakaian memori per kolom (byte, termasuk isi string/kategori), terbesar dulu."""
+    laporan = pd.DataFrame({
+        "dtype": df.dtypes.astype(str),
+        "bytes": df.memory_usage(index=False, deep=True),
+    })
+    laporan["bytes_per_baris"] = laporan["bytes"] / max(len(df), 1)
+    return laporan.sort_values("bytes", ascending=False)
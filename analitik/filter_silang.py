@@ -0,0 +1,94 @@
+# filter_silang.py
+# Filter silang (fakultas, program studi, FOMO, rentang waktu) lewat bitmap per nilai
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+
+def bangun_indeks(df_work, kolom_filter, kolom_waktu=None):
+    """Indeks filter yang dibangun sekali per versi data.
+
+    Untuk setiap kolom kategori disimpan kode per baris dan satu bitmap terkemas
+    (np.packbits, 1 bit per baris) per nilai. Kolom waktu disimpan sebagai urutan
+    baris terurut menurut waktu, sehingga rentang tanggal cukup dua searchsorted.
+    """
+    n = len(df_work)
+    grup = {}
+    for nama, c in kolom_filter.items():
+        if not c or c not in df_work.columns:
+            continue
+        kode, nilai = pd.factorize(df_work[c], sort=True)
+        bitmap = np.zeros((len(nilai), (n + 7) // 8), dtype=np.uint8)
+        for k in range(len(nilai)):
+            bitmap[k] = np.packbits(kode == k)
+        grup[nama] = {"nilai": [str(v) for v in nilai], "kode": kode, "bitmap": bitmap}
+
+    waktu = None
+    if kolom_waktu and kolom_waktu in df_work.columns:
+        t = df_work[kolom_waktu].to_numpy(dtype="datetime64[ns]")
+        urut = np.argsort(t, kind="stable")  # NaT ditaruh paling akhir
+        t_urut = t[urut]
+        valid = ~np.isnat(t_urut)
+        if valid.any():
+            waktu = {"urut": urut[valid], "nilai": t_urut[valid]}
+    return {"n": n, "grup": grup, "waktu": waktu}
+
+
+def rentang_waktu(indeks):
+    """Tanggal pertama dan terakhir di data (date), atau None bila tidak ada waktu."""
+    if indeks["waktu"] is None:
+        return None
+    t = indeks["waktu"]["nilai"]
+    return pd.Timestamp(t[0]).date(), pd.Timestamp(t[-1]).date()
+
+
+def _bits_waktu(indeks, awal, akhir):
+    # Baris dengan tanggal di [awal, akhir] (inklusif per hari)
+    w = indeks["waktu"]
+    batas = np.array([np.datetime64(awal, "ns"), np.datetime64(akhir + datetime.timedelta(days=1), "ns")])
+    i, j = np.searchsorted(w["nilai"], batas, side="left")
+    rentang = np.zeros(indeks["n"], dtype=bool)
+    rentang[w["urut"][i:j]] = True
+    return np.packbits(rentang)
+
+
+def mask_filter(indeks, pilihan):
+    """Mask boolean baris yang lolos semua filter aktif; None jika tidak ada filter aktif.
+
+    pilihan: {nama grup: tuple nilai, "waktu": (tanggal awal, tanggal akhir)}.
+    Nilai dalam satu grup digabung dengan OR, antar-grup dengan AND, semuanya
+    pada bitmap terkemas; mask baris hanya dibuka sekali di akhir.
+    """
+    bits = None
+    for nama, dipilih in pilihan.items():
+        if nama == "waktu":
+            if not dipilih or indeks["waktu"] is None:
+                continue
+            b = _bits_waktu(indeks, *dipilih)
+        else:
+            g = indeks["grup"].get(nama)
+            if g is None or not dipilih:
+                continue
+            kode = [g["nilai"].index(v) for v in dipilih if v in g["nilai"]]
+            b = np.bitwise_or.reduce(g["bitmap"][kode], axis=0) if kode else np.zeros_like(g["bitmap"][0])
+        bits = b if bits is None else bits & b
+    if bits is None:
+        return None
+    return np.unpackbits(bits, count=indeks["n"]).view(bool)
+
+
+def hitung_grup(indeks, nama, mask=None):
+    """Jumlah baris per nilai grup di antara baris yang lolos mask (Series)."""
+    g = indeks["grup"][nama]
+    kode = g["kode"] if mask is None else g["kode"][mask]
+    return pd.Series(np.bincount(kode[kode >= 0], minlength=len(g["nilai"])), index=g["nilai"])
+
+
+def opsi_tersedia(indeks, nama, mask=None):
+    """Nilai grup yang masih punya responden di bawah mask (untuk menyempitkan pilihan)."""
+    if nama not in indeks["grup"]:
+        return []
+    jumlah = hitung_grup(indeks, nama, mask)
+    return jumlah.index[jumlah > 0].tolist()
@@ -0,0 +1,273 @@
+# insight.py
+# Teks insight & kesimpulan yang diturunkan dari agregat (kubus, frekuensi, korelasi)
+
+import html
+
+import numpy as np
+
+from .agregasi import contingency, frekuensi, rata_rata
+
+NAMA_DIMENSI = {
+    "fomo": "tingkat FOMO",
+    "kemampuan": "kemampuan mengelola keuangan",
+    "kesejahteraan": "kesejahteraan psikologis",
+}
+# Nama metode interval kepercayaan (statistik.bootstrap_rata_rata) di kartu KPI
+NAMA_METODE_CI = {"bootstrap": "bootstrap", "normal": "aproksimasi normal"}
+# Kategori "baik" per dimensi yang proporsinya dibandingkan antar-kelompok
+KATEGORI_BAIK = {
+    "kesejahteraan": ["Baik"],
+    "kemampuan": ["Baik", "Sangat Baik"],
+}
+
+
+def _aman(label):
+    # Label dari data survei (nama fakultas, jawaban teks) masuk ke HTML unsafe_allow_html
+    return html.escape(str(label))
+
+
+def _persen(x):
+    # Format Indonesia: 63,4%
+    return f"{x * 100:.1f}".replace(".", ",") + "%"
+
+
+def _desimal(x):
+    return f"{x:.2f}".replace(".", ",")
+
+
+def _kekuatan(r):
+    r = abs(r)
+    for batas, kata in [(0.1, "sangat lemah"), (0.3, "lemah"), (0.5, "sedang"), (0.7, "kuat")]:
+        if r < batas:
+            return kata
+    return "sangat kuat"
+
+
+def _rupiah(x):
+    if np.isnan(x):
+        return "-"
+    return "Rp " + f"{int(round(x)):,}"
+
+
+def nilai_kpi(ringkasan):
+    """Nilai KPI Halaman 1 yang sudah diformat, dari kubus ringkasan."""
+    rata = {c: rata_rata(ringkasan, c) for c in
+            ["uang_saku_num", "pengeluaran_fomo_num", "kemampuan_num", "kesejahteraan_score", "proporsi_fomo_pct"]}
+    skor = lambda x: "-" if np.isnan(x) else f"{x:.2f}"
+    return {
+        "uang_saku": _rupiah(rata["uang_saku_num"]),
+        "pengeluaran_fomo": _rupiah(rata["pengeluaran_fomo_num"]),
+        "kemampuan": skor(rata["kemampuan_num"]),
+        "kesejahteraan": skor(rata["kesejahteraan_score"]),
+        "proporsi": "-" if np.isnan(rata["proporsi_fomo_pct"]) else f"{rata['proporsi_fomo_pct']:.1f}%",
+    }
+
+
+def nilai_ci_kpi(ci):
+    """Interval kepercayaan 95% KPI (hasil statistik.ci_kpi) yang sudah diformat, beserta metodenya."""
+    # Format sama dengan kartu KPI (nilai_kpi)
+    skor = lambda x: f"{x:.2f}"
+    format_ = {"uang_saku_num": ("uang_saku", _rupiah), "pengeluaran_fomo_num": ("pengeluaran_fomo", _rupiah),
+               "kesejahteraan_score": ("kesejahteraan", skor)}
+    return {
+        format_[c][0]: (f"95% CI {format_[c][1](h['bawah'])} – {format_[c][1](h['atas'])} "
+                        f"({NAMA_METODE_CI[h['metode']]})")
+        for c, h in ci.items() if h is not None and c in format_
+    }
+
+
+def _teks_p(p):
+    return "< 0,001" if p < 0.001 else f"= {p:.3f}".replace(".", ",")
+
+
+def teks_uji(hasil, alpha=0.05):
+    """Kalimat hasil uji χ² satu tabel kontingensi (statistik.uji_chi_kuadrat)."""
+    if hasil is None:
+        return None
+    teks = (f"Uji χ²: χ² = {_desimal(hasil['chi2'])} (df = {hasil['dof']}), p {_teks_p(hasil['p'])}, "
+            f"Cramér's V = {_desimal(hasil['cramer_v'])}. ")
+    if hasil["p"] < alpha:
+        teks += (f"Asosiasi <b>signifikan</b> pada α = {_persen(alpha)} dengan kekuatan "
+                 f"{_kekuatan(hasil['cramer_v'])}; ini menunjukkan keterkaitan, bukan sebab-akibat.")
+    else:
+        teks += (f"Asosiasi <b>tidak signifikan</b> pada α = {_persen(alpha)}; perbedaan antar-kelompok "
+                 f"bisa terjadi secara kebetulan.")
+    if hasil["harapan_kecil"] > 0.2:
+        teks += (f" {_persen(hasil['harapan_kecil'])} sel memiliki frekuensi harapan < 5, "
+                 f"sehingga hasil uji perlu ditafsirkan hati-hati.")
+    return teks
+
+
+def insight_fakultas(ringkasan):
+    fak = frekuensi(ringkasan, "fakultas")
+    if fak.sum() == 0:
+        return None
+    top = fak.idxmax()
+    return (f"Responden terbanyak berasal dari <b>{_aman(top)}</b> ({fak[top]} dari {ringkasan['n']} responden, "
+            f"{_persen(fak[top] / ringkasan['n'])}), menunjukkan partisipasi survei yang paling tinggi.")
+
+
+def insight_fomo(ringkasan, jawaban):
+    """jawaban: jumlah responden per jawaban teks pertanyaan FOMO (Series)."""
+    if jawaban is None or ringkasan["n"] == 0:
+        return None
+    bagian = jawaban / ringkasan["n"]
+    kunci = {str(k).strip().lower(): k for k in jawaban.index}
+    if "ya" in kunci and "tidak" in kunci:
+        ya, tidak = bagian[kunci["ya"]], bagian[kunci["tidak"]]
+        if tidak >= ya:
+            return (f"Mayoritas mahasiswa <b>tidak merasa FOMO</b> ({_persen(tidak)}), "
+                    f"sedangkan {_persen(ya)} mengaku merasa FOMO.")
+        return (f"Mayoritas mahasiswa <b>merasa FOMO</b> ({_persen(ya)}), "
+                f"sedangkan {_persen(tidak)} tidak merasa FOMO.")
+    top = bagian.idxmax()
+    return f"Jawaban terbanyak adalah <b>{_aman(top)}</b> ({_persen(bagian[top])})."
+
+
+def _ujung(cross):
+    # Kelompok terendah dan tertinggi (baris pertama & terakhir yang terisi)
+    return cross.index[0], cross.index[-1]
+
+
+def insight_heatmap(ringkasan, a, b):
+    cross = contingency(ringkasan, a, b)
+    if len(cross.index) < 2:
+        return None
+    rendah, tinggi = _ujung(cross)
+    m_rendah, m_tinggi = cross.loc[rendah].idxmax(), cross.loc[tinggi].idxmax()
+    return (f"Pada {NAMA_DIMENSI[a]} <b>{_aman(rendah)}</b>, {NAMA_DIMENSI[b]} terbanyak adalah "
+            f"<b>{_aman(m_rendah)}</b> ({cross.loc[rendah, m_rendah]} responden), sedangkan pada "
+            f"<b>{_aman(tinggi)}</b> terbanyak <b>{_aman(m_tinggi)}</b> ({cross.loc[tinggi, m_tinggi]} responden).")
+
+
+def tren_baik(ringkasan, a, b):
+    """Proporsi kategori baik dimensi b pada kelompok a terendah & tertinggi."""
+    cross = contingency(ringkasan, a, b)
+    if len(cross.index) < 2:
+        return None
+    baik = [c for c in KATEGORI_BAIK[b] if c in cross.columns]
+    bagian = cross[baik].sum(axis=1) / cross.sum(axis=1)
+    rendah, tinggi = _ujung(cross)
+    return {
+        "rendah": rendah, "tinggi": tinggi,
+        "p_rendah": bagian[rendah], "p_tinggi": bagian[tinggi],
+        "baik": "–".join(KATEGORI_BAIK[b]),
+    }
+
+
+def _arah(t):
+    if np.isclose(t["p_tinggi"], t["p_rendah"]):
+        return "relatif sama"
+    return "semakin menurun" if t["p_tinggi"] < t["p_rendah"] else "semakin meningkat"
+
+
+def interpretasi_fomo_kesejahteraan(ringkasan, hasil, alpha=0.05):
+    """Kalimat interpretasi Halaman 1 dari uji χ² FOMO × kesejahteraan (uji_kontingensi)."""
+    if hasil is None:
+        return None
+    if hasil["p"] >= alpha:
+        return (f"Secara statistik belum terlihat keterkaitan yang signifikan antara tingkat FOMO "
+                f"dan kesejahteraan psikologis mahasiswa (uji χ², p {_teks_p(hasil['p'])}).")
+    teks = (f"Terdapat keterkaitan yang signifikan antara tingkat FOMO dan kesejahteraan psikologis "
+            f"mahasiswa (uji χ², p {_teks_p(hasil['p'])}, kekuatan {_kekuatan(hasil['cramer_v'])})")
+    t = tren_baik(ringkasan, "fomo", "kesejahteraan")
+    if t is None:
+        return teks + "."
+    return (teks + f": semakin tinggi tingkat FOMO, proporsi kesejahteraan <b>{_aman(t['baik'])}</b> "
+            f"{_arah(t)}.")
+
+
+def insight_bar(ringkasan, a, b):
+    t = tren_baik(ringkasan, a, b)
+    if t is None:
+        return None
+    return (f"Semakin tinggi {NAMA_DIMENSI[a]}, proporsi mahasiswa dengan {NAMA_DIMENSI[b]} "
+            f"<b>{_aman(t['baik'])}</b> {_arah(t)} ({_persen(t['p_rendah'])} pada {_aman(t['rendah'])} → "
+            f"{_persen(t['p_tinggi'])} pada {_aman(t['tinggi'])}).")
+
+
+def insight_proporsi_pie(ringkasan):
+    f = frekuensi(ringkasan, "proporsi")
+    if f.sum() == 0:
+        return None
+    top = f.idxmax()
+    return (f"Kelompok terbesar berada pada kategori <b>{_aman(top)}</b> ({_persen(f[top] / f.sum())} "
+            f"responden), menandakan proporsi pengeluaran FOMO yang {_aman(top.split(' ')[0].lower())} "
+            f"terhadap uang saku.")
+
+
+def insight_proporsi_hist(ringkasan):
+    f = frekuensi(ringkasan, "proporsi")
+    mean = rata_rata(ringkasan, "proporsi_fomo_pct")
+    if f.sum() == 0 or np.isnan(mean):
+        return None
+    # Bin "Rendah" dan "Sedang" mencakup proporsi sampai dengan 50%
+    sampai_50 = (f.iloc[0] + f.iloc[1]) / f.sum()
+    return (f"Sebanyak {_persen(sampai_50)} responden memiliki proporsi FOMO paling banyak 50%, "
+            f"dengan rata-rata sekitar <b>{_persen(mean / 100)}</b>.")
+
+
+def insight_korelasi(corr):
+    """Pasangan dengan korelasi positif & negatif terkuat, plus FOMO vs kesejahteraan."""
+    if corr is None or corr.shape[1] <= 1:
+        return None
+    nilai = corr.where(~np.eye(len(corr), dtype=bool)).stack().dropna()
+    if nilai.empty:
+        return None
+    kalimat = []
+    pos, neg = nilai.idxmax(), nilai.idxmin()
+    if nilai[pos] > 0:
+        kalimat.append(f"Korelasi positif terkuat terdapat pada <b>{_aman(pos[0])}</b> dan <b>{_aman(pos[1])}</b> "
+                       f"(r = {_desimal(nilai[pos])}, {_kekuatan(nilai[pos])})")
+    if nilai[neg] < 0:
+        kalimat.append(f"korelasi negatif terkuat pada <b>{_aman(neg[0])}</b> dan <b>{_aman(neg[1])}</b> "
+                       f"(r = {_desimal(nilai[neg])}, {_kekuatan(nilai[neg])})")
+    teks = "; ".join(kalimat) + "." if kalimat else "Tidak ada pasangan variabel yang berkorelasi."
+    fomo, sejahtera = "Tingkat FOMO", "Kesejahteraan psikologis"
+    if fomo in corr.index and sejahtera in corr.columns and not np.isnan(corr.loc[fomo, sejahtera]):
+        r = corr.loc[fomo, sejahtera]
+        arah = "negatif" if r < 0 else "positif"
+        teks += (f" Hubungan tingkat FOMO dengan kesejahteraan psikologis bersifat {arah} "
+                 f"dan {_kekuatan(r)} (r = {_desimal(r)}).")
+    return teks[0].upper() + teks[1:] + " Nilai di atas 0,7 menandakan hubungan yang sangat kuat."
+
+
+def susun_insight(ringkasan, jawaban_fomo=None, korelasi=None):
+    """Semua teks insight Halaman 2 dan kartu kesimpulan Halaman 3 dalam satu lintasan.
+
+    Hanya membaca agregat yang sudah dihitung (kubus ringkasan, frekuensi jawaban
+    FOMO, matriks korelasi), tidak menyentuh data per baris. Nilai None berarti
+    data tidak cukup untuk pernyataan tersebut.
+    """
+    korelasi = korelasi or {}
+    pasangan = [("fomo", "kesejahteraan"), ("kemampuan", "kesejahteraan"), ("fomo", "kemampuan")]
+    teks = {
+        "fakultas": insight_fakultas(ringkasan),
+        "fomo": insight_fomo(ringkasan, jawaban_fomo),
+        "proporsi_pie": insight_proporsi_pie(ringkasan),
+        "proporsi_hist": insight_proporsi_hist(ringkasan),
+        "korelasi": {m: insight_korelasi(c) for m, c in korelasi.items() if m != "n"},
+    }
+    for a, b in pasangan:
+        teks[f"{a}_{b}_heatmap"] = insight_heatmap(ringkasan, a, b)
+        teks[f"{a}_{b}_bar"] = insight_bar(ringkasan, a, b)
+
+    teks["kesimpulan"] = [
+        (judul, isi) for judul, isi in [
+            ("Partisipasi Responden", teks["fakultas"]),
+            ("Fenomena FOMO", teks["fomo"]),
+            ("FOMO & Kesejahteraan Psikologis",
+             _gabung(teks["fomo_kesejahteraan_heatmap"], teks["fomo_kesejahteraan_bar"])),
+            ("Kemampuan Keuangan & Kesejahteraan",
+             _gabung(teks["kemampuan_kesejahteraan_heatmap"], teks["kemampuan_kesejahteraan_bar"])),
+            ("FOMO vs Kemampuan Keuangan",
+             _gabung(teks["fomo_kemampuan_heatmap"], teks["fomo_kemampuan_bar"])),
+            ("Proporsi Pengeluaran FOMO", _gabung(teks["proporsi_pie"], teks["proporsi_hist"])),
+            ("Korelasi Antar Variabel", teks["korelasi"].get("pearson")),
+        ] if isi
+    ]
+    return teks
+
+
+def _gabung(*kalimat):
+    return " ".join(k for k in kalimat if k) or None
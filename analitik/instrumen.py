@@ -0,0 +1,85 @@
+# instrumen.py
+# Pencatat per tahap satu rerun: waktu, puncak memori (tracemalloc), ukuran payload
+
+import contextlib
+import datetime
+import json
+import threading
+import time
+import tracemalloc
+
+# Tahap yang sedang berjalan per thread (setiap sesi Streamlit dijalankan di thread sendiri)
+_lokal = threading.local()
+
+
+def _terbuka():
+    if not hasattr(_lokal, "tahap"):
+        _lokal.tahap = []
+    return _lokal.tahap
+
+
+def rekaman_baru(**info):
+    """Rekaman kosong untuk satu rerun; info (mis. halaman) ikut disimpan apa adanya."""
+    return dict(info, waktu=datetime.datetime.now().isoformat(timespec="seconds"),
+                mulai=time.perf_counter(), tahap=[])
+
+
+@contextlib.contextmanager
+def tahap(rekaman, nama):
+    """Catat satu tahap ke rekaman["tahap"] (waktu ms, puncak memori KB, bytes payload).
+
+    Yield dict catatan; isi catatan["bytes"] untuk ukuran payload yang dihasilkan tahap.
+    Tahap boleh bersarang. Puncak memori hanya diukur selama tracemalloc aktif
+    (lihat ukur_memori) dan bersifat per proses: sesi lain yang berjalan bersamaan
+    ikut terhitung.
+    """
+    terbuka = _terbuka()
+    catatan = {"tahap": nama, "level": len(terbuka), "ms": None, "puncak_kb": None, "bytes": None}
+    lacak = tracemalloc.is_tracing()
+    if lacak:
+        awal, puncak = tracemalloc.get_traced_memory()
+        # reset_peak di bawah menghapus puncak milik tahap luar, jadi simpan dulu
+        for luar in terbuka:
+            if "_puncak" in luar:
+                luar["_puncak"] = max(luar["_puncak"], puncak)
+        tracemalloc.reset_peak()
+        catatan["_awal"] = catatan["_puncak"] = awal
+    terbuka.append(catatan)
+    t0 = time.perf_counter()
+    try:
+        yield catatan
+    finally:
+        catatan["ms"] = round((time.perf_counter() - t0) * 1000, 2)
+        terbuka.pop()
+        awal, puncak = catatan.pop("_awal", None), catatan.pop("_puncak", None)
+        if lacak and tracemalloc.is_tracing():
+            puncak = max(puncak, tracemalloc.get_traced_memory()[1])
+            catatan["puncak_kb"] = round((puncak - awal) / 1024, 1)
+        rekaman["tahap"].append(catatan)
+
+
+def selesai(rekaman):
+    """Tutup rekaman rerun: total waktu (ms) sejak rekaman_baru, siap disimpan/diekspor."""
+    mulai = rekaman.pop("mulai", None)
+    if mulai is not None:
+        rekaman["total_ms"] = round((time.perf_counter() - mulai) * 1000, 2)
+    return rekaman
+
+
+def ukur_memori(aktif):
+    """Nyalakan/matikan tracemalloc (memperlambat alokasi selama aktif, untuk semua sesi)."""
+    if aktif and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not aktif and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def ke_jsonl(rekaman):
+    """Rekaman (iterable) → teks JSON lines, satu rerun per baris."""
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rekaman)
+
+
+def tulis_jsonl(path, rekaman):
+    # Tambahkan satu rerun ke log monitoring
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(ke_jsonl([rekaman]))
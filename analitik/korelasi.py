@@ -0,0 +1,70 @@
+# korelasi.py
+# Matriks korelasi Pearson & Spearman untuk variabel analitik terdeklarasi
+
+import numpy as np
+import pandas as pd
+
+# Variabel yang dikorelasikan (kolom df_work -> label tampilan). Kolom identitas
+# atau kolom mentah yang sudah terwakili turunannya sengaja tidak dimasukkan.
+VARIABEL_KORELASI = {
+    "uang_saku_num": "Uang saku",
+    "pengeluaran_fomo_num": "Pengeluaran FOMO",
+    "proporsi_fomo_pct": "Proporsi FOMO (%)",
+    "fomo_num": "Tingkat FOMO",
+    "kemampuan_num": "Kemampuan keuangan",
+    "kesejahteraan_score": "Kesejahteraan psikologis",
+}
+
+
+def _pearson(X):
+    """Korelasi Pearson antar kolom X (n × k, boleh berisi NaN) dan jumlah pasangan valid.
+
+    Tanpa NaN cukup satu perkalian matriks terpusat Xc.T @ Xc. Dengan NaN dipakai
+    pasangan lengkap (pairwise-complete) seperti DataFrame.corr(): jumlah, jumlah
+    kuadrat, dan hasil kali per pasangan kolom dihitung lewat perkalian matriks
+    dengan matriks mask, tanpa loop per pasangan.
+    """
+    n_baris, k = X.shape
+    valid = ~np.isnan(X)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if valid.all():
+            Xc = X - X.mean(axis=0)
+            cov = Xc.T @ Xc
+            var = np.diag(cov)
+            corr = cov / np.sqrt(np.outer(var, var))
+            n = np.full((k, k), n_baris)
+        else:
+            M = valid.astype("float64")
+            # Dipusatkan di rata-rata kolom dulu agar rumus jumlah-kuadrat tetap stabil
+            Xc = np.where(valid, X - np.nanmean(X, axis=0), 0.0)
+            n = M.T @ M
+            sx = Xc.T @ M              # sx[i, j] = Σ x_i pada baris di mana i dan j valid
+            sxx = (Xc * Xc).T @ M
+            cov = Xc.T @ Xc - sx * sx.T / n
+            var_i = sxx - sx * sx / n
+            corr = cov / np.sqrt(var_i * var_i.T)
+    corr[n < 2] = np.nan
+    return np.clip(corr, -1.0, 1.0), n.astype("int64")
+
+
+def correlation_matrices(df_work, variabel=VARIABEL_KORELASI, mask=None):
+    """Pearson, Spearman, dan jumlah pasangan valid untuk variabel yang tersedia.
+
+    mask (boolean per baris) membatasi perhitungan ke subset hasil filter.
+    Kolom yang tidak ada atau seluruhnya kosong dilewati. Spearman adalah Pearson
+    atas ranking rata-rata tiap kolom; bila ada NaN, ranking dihitung per kolom
+    (bukan per pasangan), sehingga bisa sedikit berbeda dari DataFrame.corr("spearman").
+    """
+    kolom = [c for c in variabel if c in df_work.columns]
+    X = df_work[kolom].to_numpy(dtype="float64", na_value=np.nan)
+    if mask is not None:
+        X = X[mask]
+    terisi = ~np.isnan(X).all(axis=0)
+    kolom, X = [c for c, t in zip(kolom, terisi) if t], X[:, terisi]
+    labels = [variabel[c] for c in kolom]
+    R = pd.DataFrame(X).rank().to_numpy()
+
+    pearson, n = _pearson(X)
+    spearman, _ = _pearson(R)
+    bingkai = lambda m: pd.DataFrame(m, index=labels, columns=labels)
+    return {"pearson": bingkai(pearson), "spearman": bingkai(spearman), "n": bingkai(n)}
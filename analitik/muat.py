@@ -0,0 +1,279 @@
+# muat.py
+# Tahap load (CSV per blok) + build penuh, ingest inkremental, dan cache biner Feather
+
+import contextlib
+import hashlib
+import io
+import json
+import mmap
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from .agregasi import ringkas, tambah_ringkasan
+from .bersih import _kode_likert, clean
+from .instrumen import tahap
+from .skema import KOLOM_KATEGORI, kolom_analitik, resolve_kolom
+from .turunan import derive, pilih_fomo
+
+
+DATA_PATH = "Data Eda Threeasure_Updated.csv"
+CHUNK_ROWS = 100_000
+# Sumber dengan akhiran ini dibaca dari basis data SQLite (basisdata.py), selain itu CSV
+SUFIKS_SQLITE = (".db", ".sqlite", ".sqlite3")
+
+
+def adalah_sqlite(path):
+    return str(path).lower().endswith(SUFIKS_SQLITE)
+
+
+def source_fingerprint(path=DATA_PATH):
+    # Kunci cache: path + mtime + ukuran file, berubah setiap kali CSV diganti
+    stat = os.stat(path)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+def read_chunks(source=DATA_PATH, chunksize=CHUNK_ROWS, names=None):
+    # Hanya kolom analitik, dengan dtype eksplisit, dibaca per blok agar memori puncak
+    # dibatasi satu blok mentah (bukan seluruh file) ditambah hasil turunan yang ringkas.
+    # names diisi saat membaca potongan file tanpa baris header (mode append).
+    return pd.read_csv(
+        source,
+        header=None if names else "infer",
+        names=names,
+        usecols=kolom_analitik,
+        dtype={c: "category" for c in KOLOM_KATEGORI},
+        chunksize=chunksize,
+    )
+
+
+def _samakan_angka(chunks, c):
+    # dtype kolom di luar KOLOM_KATEGORI ditebak per blok: satu jawaban teks liar (mis.
+    # "tiga" di kolom skor) membuat bloknya bertipe teks sementara blok lain angka. Kolom
+    # yang angka di sebagian blok berisi dijadikan angka di semua blok (teks liar → NA).
+    # Blok yang seluruhnya kosong tidak ikut menentukan.
+    isi = [ch[c] for ch in chunks if ch[c].notna().any()]
+    angka = [pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s) for s in isi]
+    if not any(angka) or all(angka) or any(isinstance(s.dtype, pd.CategoricalDtype) for s in isi):
+        return
+    for ch in chunks:
+        ch[c] = _kode_likert(pd.to_numeric(ch[c], errors="coerce"))
+
+
+def _gabung_chunks(chunks):
+    # Samakan kategori antar-blok dulu supaya hasil concat tetap bertipe category
+    for c in chunks[0].columns:
+        _samakan_angka(chunks, c)
+        dtypes = {str(ch[c].dtype) for ch in chunks}
+        if len(dtypes) > 1 and all(pd.api.types.is_numeric_dtype(ch[c]) for ch in chunks):
+            # Mis. satu blok berisi skor Likert bulat (UInt8) dan blok lain berisi pecahan
+            for ch in chunks:
+                ch[c] = ch[c].astype("float32")
+        elif isinstance(chunks[0][c].dtype, pd.CategoricalDtype):
+            cats = chunks[0][c].cat.categories
+            for ch in chunks[1:]:
+                cats = cats.union(ch[c].cat.categories)
+            for ch in chunks:
+                ch[c] = ch[c].cat.set_categories(cats)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def load(path=DATA_PATH, chunksize=CHUNK_ROWS, batas=None):
+    """Tahap load: (iterator blok mentah, peta peran → nama kolom) dari CSV survei.
+
+    batas (opsional): hanya byte [0, batas) yang dibaca, lihat _akhir_baris.
+    """
+    header = pd.read_csv(path, nrows=0, usecols=kolom_analitik).columns
+    source = path if batas is None else _buka_terbatas(path, batas)
+    return read_chunks(source, chunksize), resolve_kolom(header)
+
+
+def _tahap(rekaman, nama):
+    # Catat tahap hanya bila ada rekaman (benchmark/instrumentasi); selain itu tanpa biaya
+    return contextlib.nullcontext() if rekaman is None else tahap(rekaman, nama)
+
+
+def _derive_semua(chunks, kolom, path, rekaman=None):
+    # Satu catatan load/clean/derive per blok di rekaman (jumlahkan per nama tahap)
+    frames = []
+    while True:
+        with _tahap(rekaman, "load"):
+            chunk = next(chunks, None)
+        if chunk is None:
+            break
+        with _tahap(rekaman, "clean"):
+            chunk = clean(chunk, kolom)
+        with _tahap(rekaman, "derive"):
+            frames.append(derive(chunk, kolom))
+    if not frames:
+        kosong = pd.read_csv(path, nrows=0, usecols=kolom_analitik)
+        frames = [derive(clean(kosong, kolom), kolom)]
+    with _tahap(rekaman, "derive"):
+        return _gabung_chunks(frames)
+
+
+def build_from_csv(path, rekaman=None, ukuran=None):
+    """load → clean → derive → select_fomo → aggregate untuk seluruh CSV; kembalikan (df_work, info).
+
+    Hanya baris lengkap dalam `ukuran` byte pertama (bawaan: ukuran file saat ini) yang
+    dibaca; info["offset"] mencatat akhir byte yang sudah diproses (lihat append_rows).
+    rekaman (opsional, instrumen.rekaman_baru) menerima waktu setiap tahap; select_fomo
+    dicatat sebagai bagian dari derive.
+    """
+    offset = _akhir_baris(path, 0, os.path.getsize(path) if ukuran is None else ukuran)
+    with _tahap(rekaman, "load"):
+        chunks, kolom = load(path, batas=offset)
+    df_work = _derive_semua(iter(chunks), kolom, path, rekaman)
+    with _tahap(rekaman, "derive"):
+        df_work, fomo_angka = pilih_fomo(df_work)
+    with _tahap(rekaman, "aggregate"):
+        info = {"kolom": kolom, "fomo_angka": fomo_angka, "ringkasan": ringkas(df_work), "offset": offset}
+    return df_work, info
+
+
+# ---------------------------
+# Ingest inkremental (baris yang ditambahkan di akhir CSV)
+# ---------------------------
+# Ekspor survei hanya menambah baris di akhir file. Selama header dan byte terakhir
+# yang sudah diproses tidak berubah, cukup baris setelah offset itu yang di-parse.
+# Pembacaan selalu dibatasi ukuran file saat sidik diambil (source_fingerprint) dan
+# berhenti di '\n' terakhir: byte yang ditambahkan sesudahnya, termasuk baris yang
+# masih setengah ditulis, menunggu ingest berikutnya.
+EKOR_BYTES = 4096
+
+
+def _akhir_baris(path, awal, akhir):
+    # Posisi tepat setelah '\n' terakhir dalam [awal, akhir); awal jika tidak ada baris lengkap
+    with open(path, "rb") as f:
+        pos = akhir
+        while pos > awal:
+            mulai = max(awal, pos - EKOR_BYTES)
+            f.seek(mulai)
+            i = f.read(pos - mulai).rfind(b"\n")
+            if i >= 0:
+                return mulai + i + 1
+            pos = mulai
+    return awal
+
+
+def _buka_terbatas(path, batas):
+    # Tampilan read-only atas `batas` byte pertama file (mmap, tanpa menyalin isinya)
+    with open(path, "rb") as f:
+        batas = min(batas, os.fstat(f.fileno()).st_size)
+        if not batas:
+            return io.BytesIO()
+        return mmap.mmap(f.fileno(), length=batas, access=mmap.ACCESS_READ)
+
+
+def _sidik_file(path, offset):
+    # Hash header (baris pertama) dan EKOR_BYTES byte sebelum offset
+    with open(path, "rb") as f:
+        header = f.readline()
+        f.seek(max(0, offset - EKOR_BYTES))
+        ekor = f.read(min(offset, EKOR_BYTES))
+    return {
+        "offset": offset,
+        "header": hashlib.sha1(header).hexdigest(),
+        "ekor": hashlib.sha1(ekor).hexdigest(),
+    }
+
+
+def _bisa_append(info, path, ukuran):
+    sidik = info.get("sidik")
+    if not sidik or ukuran <= sidik["offset"]:
+        return False
+    return _sidik_file(path, sidik["offset"]) == sidik
+
+
+def append_rows(df_work, info, path, ukuran):
+    # Parse + derive hanya baris lengkap di [offset, ukuran), lalu perbarui ringkasan
+    # KPI/kontingensi secara in place dan geser info["offset"]
+    names = list(pd.read_csv(path, nrows=0).columns)
+    offset = info["sidik"]["offset"]
+    akhir = _akhir_baris(path, offset, ukuran)
+    with open(path, "rb") as f:
+        f.seek(offset)
+        baru_bytes = f.read(akhir - offset)
+    info["offset"] = akhir
+    if not baru_bytes:
+        return df_work, info
+    baru = _derive_semua(read_chunks(io.BytesIO(baru_bytes), names=names), info["kolom"], path)
+    baru, _ = pilih_fomo(baru, info["fomo_angka"])
+    if len(baru):
+        tambah_ringkasan(info["ringkasan"], ringkas(baru))
+        df_work = _gabung_chunks([df_work, baru])
+    return df_work, info
+
+
+# ---------------------------
+# Cache biner (Feather) di samping CSV
+# ---------------------------
+# Naikkan setiap kali logika resolve_kolom/clean/derive berubah, agar file lama tidak dipakai
+CACHE_VERSION = "9"
+
+
+def cache_path(path=DATA_PATH):
+    # Akhiran sumber ikut di nama cache, supaya x.csv dan x.db tidak berbagi satu file
+    return path + ".feather"
+
+
+def _baca_cache_biner(path):
+    cache = cache_path(path)
+    if not os.path.exists(cache):
+        return None
+    try:
+        table = feather.read_table(cache, memory_map=True)
+    except (OSError, pa.ArrowInvalid):
+        return None
+    info = json.loads((table.schema.metadata or {}).get(b"threeasure", b"{}"))
+    if info.get("versi") != CACHE_VERSION:
+        return None
+    return table, info
+
+
+def _tulis_cache_biner(source_fingerprint, df_work, info):
+    path = source_fingerprint[0]
+    cache = cache_path(path)
+    info = dict(info, versi=CACHE_VERSION, sumber=list(source_fingerprint[1:]),
+                sidik=_sidik_file(path, info.get("offset", source_fingerprint[2])))
+    tmp = f"{cache}.{os.getpid()}.tmp"
+    try:
+        table = pa.Table.from_pandas(df_work, preserve_index=False)
+        meta = dict(table.schema.metadata or {})
+        meta[b"threeasure"] = json.dumps(info).encode()
+        # Tanpa kompresi supaya bisa di-memory-map; tulis ke file sementara lalu rename (atomik)
+        feather.write_feather(table.replace_schema_metadata(meta), tmp, compression="uncompressed")
+        os.replace(tmp, cache)
+    except (OSError, pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # Cache hanya optimasi: direktori read-only atau kolom yang tidak bisa disimpan Arrow
+        # (mis. campuran angka & teks) melewati cache biner, CSV tetap menjadi sumber
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def load_df(source_fingerprint):
+    # Cold start: pakai file Feather jika masih sesuai dengan sumbernya; jika CSV hanya
+    # bertambah baris di akhir, proses baris baru saja; selain itu bangun ulang dari sumber.
+    # Sumber .db/.sqlite dibaca lewat basisdata.py (diimpor di sini saja: basisdata
+    # memakai load/_derive_semua dari modul ini, dan sumber CSV tidak perlu sqlite3).
+    path = source_fingerprint[0]
+    sqlite = adalah_sqlite(path)
+    cache = _baca_cache_biner(path)
+    if cache is not None:
+        table, info = cache
+        if info.get("sumber") == list(source_fingerprint[1:]):
+            return table.to_pandas(), info["kolom"], info["ringkasan"]
+        if not sqlite and _bisa_append(info, path, source_fingerprint[2]):
+            df_work, info = append_rows(table.to_pandas(), info, path, source_fingerprint[2])
+            _tulis_cache_biner(source_fingerprint, df_work, info)
+            return df_work, info["kolom"], info["ringkasan"]
+
+    if sqlite:
+        from .basisdata import build_from_sqlite
+        df_work, info = build_from_sqlite(path)
+    else:
+        df_work, info = build_from_csv(path, ukuran=source_fingerprint[2])
+    _tulis_cache_biner(source_fingerprint, df_work, info)
+    return df_work, info["kolom"], info["ringkasan"]
@@ -0,0 +1,49 @@
+# rupiah.py
+# Parser nominal Rupiah berbasis operasi vektor (pandas .str + cast float)
+
+import numpy as np
+import pandas as pd
+
+# "Rp", "Rp.", " rp " di depan nilai
+_PREFIX_RP = r"(?i)^\s*rp\.?\s*"
+# 1.500.000 atau 1.500.000,50 (titik sebagai pemisah ribuan, format Indonesia)
+_RIBUAN_TITIK = r"-?\d{1,3}(?:\.\d{3})+(?:,\d+)?"
+# 1,500,000 atau 1,500,000.50 (koma sebagai pemisah ribuan)
+_RIBUAN_KOMA = r"-?\d{1,3}(?:,\d{3})+(?:\.\d+)?"
+# Bentuk akhir yang boleh di-cast ke float: 2000000, 2000000.0, -150000.5
+_ANGKA = r"-?\d+(?:\.\d+)?"
+
+
+def _parse_teks(s):
+    s = s.astype("string").str.replace(_PREFIX_RP, "", regex=True).str.strip()
+
+    titik = s.str.fullmatch(_RIBUAN_TITIK).fillna(False)
+    koma = s.str.fullmatch(_RIBUAN_KOMA).fillna(False)
+    if titik.any():
+        s = s.mask(titik, s.str.replace(".", "", regex=False))
+    if koma.any():
+        s = s.mask(koma, s.str.replace(",", "", regex=False))
+    # Sisa koma adalah koma desimal ("1500000,5" atau "1.500.000,5" setelah titik dibuang)
+    s = s.str.replace(",", ".", regex=False)
+
+    # Nilai yang tidak valid ("-", "", "abc") dijadikan NA dulu supaya cast tidak gagal
+    valid = s.str.fullmatch(_ANGKA).fillna(False)
+    return s.where(valid).astype("float64").to_numpy()
+
+
+def parse_rupiah(values):
+    """Ubah kolom nominal uang (angka atau teks) menjadi float64.
+
+    Kolom yang sudah numerik (mis. "2000000.0" yang dibaca read_csv sebagai
+    float) dikembalikan apa adanya. Kolom teks di-factorize dulu sehingga
+    pembersihan "Rp", pemisah ribuan titik/koma, dan koma desimal hanya
+    dijalankan sekali per nilai unik; nilai yang tidak terbaca menjadi NaN.
+    """
+    s = values if isinstance(values, pd.Series) else pd.Series(values)
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        return s.astype("float64")
+
+    codes, uniques = pd.factorize(s)
+    parsed = np.append(_parse_teks(pd.Series(uniques)), np.nan)
+    # codes == -1 (nilai kosong) menunjuk ke NaN di posisi terakhir
+    return pd.Series(parsed[codes], index=s.index, dtype="float64")
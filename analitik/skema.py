@@ -0,0 +1,107 @@
+# skema.py
+# Kolom survei: daftar kolom per peran + pencocokan nama kolom ke peran analitik
+
+import functools
+import re
+
+# Identitas responden tidak pernah dibaca: dashboard tidak memplotnya
+KOLOM_PII = ["nama_lengkap", "npm", "no_whatshapp", "email_address"]
+# Jawaban teks dengan sedikit nilai unik dibaca langsung sebagai category
+KOLOM_KATEGORI = [
+    "fakultas",
+    "program_studi",
+    "ketersediaan_responden",
+    "sering_merasa_fomo",
+    "kebutuhan_akan_dukungan_emosional_dan_bantuan_psikologis",
+    "adanya_strategi_untuk_mengatasi_stress",
+]
+# Skala jawaban teks (sesudah strip + huruf kecil) → nilai
+YA_TIDAK = {"ya": True, "tidak": False}
+SKOR_FOMO = {"tidak": 1, "tidak pernah": 1, "ya": 5, "sering": 4, "sangat sering": 5,
+             "kadang-kadang": 3, "kadang": 3, "jarang": 2, "jarang sekali": 2}
+# Normalisasi jawaban teks saat clean (bersih.normalisasi_jawaban), dihitung per nilai unik.
+# Sumber berupa nama kolom ("kolom") atau peran resolve_kolom ("peran"); hasil ditulis ke
+# kolom "hasil" atau menimpa kolom sumber. Skala None berarti jawabannya berupa angka.
+# Jawaban di luar skala menjadi NA.
+JAWABAN = [
+    {"kolom": "ketersediaan_responden", "skala": YA_TIDAK, "dtype": "boolean"},
+    {"kolom": "kebutuhan_akan_dukungan_emosional_dan_bantuan_psikologis", "skala": YA_TIDAK, "dtype": "boolean"},
+    {"kolom": "adanya_strategi_untuk_mengatasi_stress", "skala": YA_TIDAK, "dtype": "boolean"},
+    # Skor FOMO dari teks, dan jawaban angka bila ekspornya berisi angka (dipilih pilih_fomo)
+    {"peran": "fomo_text", "skala": SKOR_FOMO, "dtype": "float64", "hasil": "fomo_num"},
+    {"peran": "fomo_text", "skala": None, "dtype": "float64", "hasil": "_fomo_angka"},
+]
+# Kolom turunan kontinu (uang, rasio, skor rata-rata) disimpan sebagai float32
+KOLOM_FLOAT = ["uang_saku_num", "pengeluaran_fomo_num", "proporsi_fomo_pct", "kesejahteraan_score", "mean_distress"]
+# Format timestamp ekspor Google Form, mis. "9/10/2025 12:35:31"
+FORMAT_WAKTU = "%m/%d/%Y %H:%M:%S"
+
+
+class KolomTidakDikenali(ValueError):
+    """Header survei tidak bisa dipetakan ke peran analitik (mis. pola yang ambigu)."""
+
+
+def kolom_analitik(nama):
+    return nama.lower().strip() not in KOLOM_PII
+
+
+# Peran analitik → pola nama kolom, dari yang paling spesifik. Satu pola adalah token
+# (dipisah spasi) yang semuanya harus ada di nama kolom; nama kolom dipecah menjadi token
+# di setiap karakter non-alfanumerik, jadi "x1" tidak cocok dengan "x10" dan "emosi" tidak
+# cocok dengan "emosional". Peran diselesaikan menurut urutan tabel ini dan satu kolom
+# hanya dipakai satu peran: teks & frekuensi FOMO didahulukan supaya pola uang/pengeluaran
+# tidak mengambil kolom FOMO.
+SKEMA = {
+    "timestamp": ["timestamp", "waktu"],
+    "fakultas": ["fakultas"],
+    "program_studi": ["program studi", "prodi"],
+    "fomo_text": ["sering merasa fomo", "merasa fomo"],
+    "freq_fomo": ["frekuensi fomo pengeluaran", "frekuensi fomo", "tingkat fomo", "skor fomo", "x4"],
+    "uang_saku": ["uang saku", "uang", "saku", "x1"],
+    "pengeluaran_fomo": ["pengeluaran fomo", "pengeluaran", "x2"],
+    "kemampuan": ["kemampuan mengelola keuangan", "kemampuan", "mengelola keuangan", "x3"],
+    "kesejahteraan_explicit": ["kesejahteraan psikologis", "kesejahteraan"],
+    "distress_1": ["pengaruh emosi", "emosi", "x5"],
+    "distress_2": ["frekuensi stres fin", "stres fin", "x6"],
+    "distress_3": ["hilang semangat", "x7"],
+    "distress_4": ["frekuensi stres fomo", "stres fomo", "x8"],
+}
+
+
+def _token(nama):
+    return tuple(t for t in re.split(r"[^0-9a-z]+", str(nama).lower()) if t)
+
+
+def _cocok(pola, token_kolom, bebas):
+    # Kolom bebas yang namanya persis pola menang; selain itu semua kolom yang memuat token pola
+    token = tuple(pola.split())
+    persis = [c for c in bebas if token_kolom[c] == token]
+    return persis or [c for c in bebas if set(token) <= set(token_kolom[c])]
+
+
+@functools.lru_cache(maxsize=64)
+def _kompilasi(header):
+    token_kolom = {c: _token(c) for c in header}
+    bebas = list(header)
+    kolom = {}
+    for peran, daftar_pola in SKEMA.items():
+        kolom[peran] = None
+        for pola in daftar_pola:
+            calon = _cocok(pola, token_kolom, bebas)
+            if len(calon) > 1:
+                raise KolomTidakDikenali(f"Kolom untuk peran {peran!r} ambigu (pola {pola!r}): {calon}")
+            if calon:
+                kolom[peran] = calon[0]
+                bebas.remove(calon[0])
+                break
+    return kolom
+
+
+def resolve_kolom(columns):
+    """Peta peran analitik → nama kolom (None jika tidak ada) untuk satu header.
+
+    Hasilnya di-cache per tuple header, jadi banyak file dengan tata letak ekspor yang
+    sama cukup diselesaikan sekali. KolomTidakDikenali jika satu pola cocok dengan lebih dari
+    satu kolom yang belum dipakai: lebih baik gagal daripada diam-diam memilih kolom salah.
+    """
+    return dict(_kompilasi(tuple(columns)))
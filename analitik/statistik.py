@@ -0,0 +1,144 @@
+# statistik.py
+# Uji chi-kuadrat + Cramér's V per tabel kontingensi dan CI bootstrap rata-rata KPI
+
+import math
+from statistics import NormalDist
+
+import numpy as np
+
+from .agregasi import contingency
+
+# Pasangan tabel kontingensi yang ditampilkan di Halaman 2 (baris, kolom)
+PASANGAN_UJI = [("fomo", "kesejahteraan"), ("kemampuan", "kesejahteraan"), ("fomo", "kemampuan")]
+# KPI yang diberi interval kepercayaan di Halaman 1
+KOLOM_CI = ["uang_saku_num", "pengeluaran_fomo_num", "kesejahteraan_score"]
+N_BOOTSTRAP = 10_000
+# Resampel lewat cacah multinomial bila nilai uniknya paling banyak sekian
+MAKS_UNIK_MULTINOMIAL = 4096
+# Batas elemen matriks cacah/indeks per blok (~128 MB int64), agar kohort besar tidak meledakkan memori
+MAKS_ELEMEN_BLOK = 16_000_000
+# Batas total elemen indeks (n_bootstrap × n); di atasnya dipakai pendekatan normal
+MAKS_ELEMEN_INDEKS = 50_000_000
+
+
+def _gamma_atas(a, x):
+    """Fungsi gamma tak lengkap atas ter-regularisasi Q(a, x) (deret / pecahan berlanjut)."""
+    if x <= 0:
+        return 1.0
+    ln_depan = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1:
+        # Deret untuk P(a, x), lalu Q = 1 - P
+        suku = jumlah = 1.0 / a
+        ap = a
+        for _ in range(1000):
+            ap += 1
+            suku *= x / ap
+            jumlah += suku
+            if abs(suku) < abs(jumlah) * 1e-15:
+                break
+        return max(0.0, 1.0 - jumlah * math.exp(ln_depan))
+    # Pecahan berlanjut (metode Lentz) untuk Q(a, x)
+    kecil = 1e-300
+    b = x + 1 - a
+    c, d = 1 / kecil, 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = kecil if abs(d) < kecil else d
+        c = b + an / c
+        c = kecil if abs(c) < kecil else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(ln_depan) * h
+
+
+def p_chi_kuadrat(statistik, dof):
+    """P(X ≥ statistik) untuk X ~ χ²(dof)."""
+    return _gamma_atas(dof / 2, statistik / 2)
+
+
+def uji_chi_kuadrat(cross):
+    """Uji independensi χ² untuk satu tabel kontingensi (DataFrame jumlah).
+
+    Mengembalikan dict chi2, dof, p, cramer_v, n, dan porsi sel dengan frekuensi
+    harapan < 5 (uji kurang andal bila besar); None jika tabel kurang dari 2 × 2.
+    """
+    o = np.asarray(cross, dtype="float64")
+    o = o[o.sum(axis=1) > 0][:, o.sum(axis=0) > 0]
+    if o.ndim != 2 or min(o.shape) < 2:
+        return None
+    n = o.sum()
+    e = np.outer(o.sum(axis=1), o.sum(axis=0)) / n
+    chi2 = float(((o - e) ** 2 / e).sum())
+    dof = (o.shape[0] - 1) * (o.shape[1] - 1)
+    return {
+        "chi2": chi2,
+        "dof": dof,
+        "p": p_chi_kuadrat(chi2, dof),
+        "cramer_v": math.sqrt(chi2 / (n * (min(o.shape) - 1))),
+        "n": int(n),
+        "harapan_kecil": float((e < 5).mean()),
+    }
+
+
+def uji_kontingensi(ringkasan, pasangan=PASANGAN_UJI):
+    """Hasil uji_chi_kuadrat per pasangan dimensi kubus, kunci "a_b"."""
+    return {f"{a}_{b}": uji_chi_kuadrat(contingency(ringkasan, a, b)) for a, b in pasangan}
+
+
+def bootstrap_rata_rata(nilai, n_bootstrap=N_BOOTSTRAP, alpha=0.05, seed=0):
+    """Interval kepercayaan (1 - alpha) rata-rata; None jika < 2 nilai.
+
+    Semua resampel diambil sekaligus tanpa loop per resampel. Bila nilai uniknya sedikit
+    (skor Likert, nominal uang), resampel diwakili matriks cacah multinomial
+    n_bootstrap × unik, yang distribusinya identik dengan resampel baris; selain itu
+    dipakai matriks indeks n_bootstrap × n. Keduanya dipecah per blok baris agar satu
+    blok tidak melebihi MAKS_ELEMEN_BLOK elemen. Untuk
+    nilai kontinu pada kohort sangat besar (lebih dari MAKS_ELEMEN_INDEKS elemen)
+    distribusi bootstrap rata-rata sudah praktis normal, jadi dipakai rata ± z·s/√n.
+    Kunci "metode" ("bootstrap" atau "normal") mencatat cara yang dipakai.
+    """
+    x = np.asarray(nilai, dtype="float64")
+    x = x[~np.isnan(x)]
+    n = len(x)
+    if n < 2:
+        return None
+    rng = np.random.default_rng(seed)
+    unik, kode = np.unique(x, return_inverse=True)
+    if len(unik) <= MAKS_UNIK_MULTINOMIAL and len(unik) * 8 <= n:
+        peluang = np.bincount(kode) / n
+        per_blok = max(1, MAKS_ELEMEN_BLOK // len(unik))
+        rata = np.concatenate([
+            rng.multinomial(n, peluang, size=min(per_blok, n_bootstrap - i)) @ unik / n
+            for i in range(0, n_bootstrap, per_blok)
+        ])
+    elif n_bootstrap * n > MAKS_ELEMEN_INDEKS:
+        z = NormalDist().inv_cdf(1 - alpha / 2)
+        se = x.std(ddof=1) / math.sqrt(n)
+        return {"rata": float(x.mean()), "bawah": float(x.mean() - z * se),
+                "atas": float(x.mean() + z * se), "n": n, "metode": "normal"}
+    else:
+        per_blok = max(1, MAKS_ELEMEN_BLOK // n)
+        rata = np.concatenate([
+            x[rng.integers(0, n, size=(min(per_blok, n_bootstrap - i), n))].mean(axis=1)
+            for i in range(0, n_bootstrap, per_blok)
+        ])
+    bawah, atas = np.quantile(rata, [alpha / 2, 1 - alpha / 2])
+    return {"rata": float(x.mean()), "bawah": float(bawah), "atas": float(atas), "n": n,
+            "metode": "bootstrap"}
+
+
+def ci_kpi(basis, mask=None, kolom=KOLOM_CI, **kwargs):
+    """CI rata-rata (bootstrap_rata_rata) per kolom KPI dari nilai basis_ringkasan (subset mask bila ada)."""
+    hasil = {}
+    for c in kolom:
+        if c in basis["nilai"]:
+            v = basis["nilai"][c]
+            hasil[c] = bootstrap_rata_rata(v if mask is None else v[mask], **kwargs)
+    return hasil
+
@@ -0,0 +1,89 @@
+# tren.py
+# Ember harian (jumlah respons + jumlah/cacah nilai ukuran) dan rata-rata bergulir per tanggal
+
+import numpy as np
+import pandas as pd
+
+# Ukuran yang ditampilkan di halaman tren (kolom df_work -> label tampilan)
+UKURAN_TREN = {
+    "fomo_num": "Tingkat FOMO",
+    "kesejahteraan_score": "Kesejahteraan psikologis",
+    "proporsi_fomo_pct": "Proporsi FOMO (%)",
+}
+KOLOM_WAKTU = "waktu"
+
+
+def ember_harian(df_work, mask=None, ukuran=UKURAN_TREN):
+    """Ember per hari kalender dari kolom waktu (sudah di-parse saat clean); None jika kosong.
+
+    Setiap hari antara tanggal pertama dan terakhir mendapat satu ember (hari tanpa
+    respons bernilai 0), berisi jumlah respons serta jumlah nilai & cacah terisi per
+    ukuran. Isinya aditif seperti kubus ringkasan, sehingga rentang waktu cukup diiris
+    (potong_ember) dan rata-rata bergulir dihitung dari jumlah kumulatif.
+    """
+    if KOLOM_WAKTU not in df_work.columns:
+        return None
+    hari = df_work[KOLOM_WAKTU].to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    valid = ~np.isnat(hari)
+    if mask is not None:
+        valid &= mask
+    if not valid.any():
+        return None
+    awal = hari[valid].min()
+    kode = (hari[valid] - awal).astype(np.int64)
+    n_hari = int(kode.max()) + 1
+    ember = {
+        "hari": awal + np.arange(n_hari),
+        "n": np.bincount(kode, minlength=n_hari),
+        "jumlah": {},
+        "terisi": {},
+    }
+    for c in ukuran:
+        if c not in df_work.columns:
+            continue
+        x = df_work[c].to_numpy(dtype="float64", na_value=np.nan)[valid]
+        ada = ~np.isnan(x)
+        ember["jumlah"][c] = np.bincount(kode[ada], weights=x[ada], minlength=n_hari)
+        ember["terisi"][c] = np.bincount(kode[ada], minlength=n_hari)
+    return ember
+
+
+def potong_ember(ember, awal=None, akhir=None):
+    """Ember dalam rentang tanggal [awal, akhir] (inklusif), lewat dua searchsorted."""
+    if ember is None:
+        return None
+    hari = ember["hari"]
+    i = 0 if awal is None else np.searchsorted(hari, np.datetime64(awal, "D"), side="left")
+    j = len(hari) if akhir is None else np.searchsorted(hari, np.datetime64(akhir, "D"), side="right")
+    if i >= j:
+        return None
+    return {
+        "hari": hari[i:j],
+        "n": ember["n"][i:j],
+        "jumlah": {c: a[i:j] for c, a in ember["jumlah"].items()},
+        "terisi": {c: a[i:j] for c, a in ember["terisi"].items()},
+    }
+
+
+def _bergulir(a, jendela):
+    # Jumlah bergulir jendela hari (termasuk hari ini) lewat selisih jumlah kumulatif
+    kum = np.concatenate([[0.0], np.cumsum(a, dtype="float64")])
+    awal = np.maximum(np.arange(1, len(a) + 1) - jendela, 0)
+    return kum[1:] - kum[awal]
+
+
+def tabel_tren(ember, jendela=7):
+    """DataFrame per tanggal: jumlah respons, rata-rata harian & bergulir setiap ukuran.
+
+    Rata-rata bergulir = jumlah nilai dalam jendela / cacah terisi dalam jendela, jadi
+    setiap respons berbobot sama (bukan rata-rata dari rata-rata harian).
+    """
+    if ember is None:
+        return None
+    tabel = {"respons": ember["n"]}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for c, jumlah in ember["jumlah"].items():
+            terisi = ember["terisi"][c]
+            tabel[c] = np.where(terisi > 0, jumlah / terisi, np.nan)
+            tabel[f"{c}_bergulir"] = _bergulir(jumlah, jendela) / _bergulir(terisi, jendela)
+    return pd.DataFrame(tabel, index=pd.DatetimeIndex(ember["hari"], name="tanggal"))
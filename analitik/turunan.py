@@ -0,0 +1,55 @@
+# turunan.py
+# Tahap derive: proporsi FOMO, skor FOMO, skor kesejahteraan (6 - rata-rata distress)
+
+import numpy as np
+import pandas as pd
+
+from .bersih import _angka, compact
+
+
+def derive(df_work, kolom):
+    """Blok baru berisi kolom turunan dari hasil clean(), dengan dtype yang sudah diringkas.
+
+    Skor FOMO dari jawaban teks (fomo_num) dan jawaban angkanya (_fomo_angka) sudah dibuat
+    saat clean (tabel JAWABAN); pilihan di antara keduanya baru bisa diputuskan setelah
+    semua blok terkumpul (lihat pilih_fomo). Tanpa kolom teks FOMO dipakai skor frekuensi.
+    """
+    df_work = df_work.copy(deep=False)
+    df_work["proporsi_fomo_pct"] = (df_work["pengeluaran_fomo_num"] / df_work["uang_saku_num"]) * 100
+    df_work["proporsi_fomo_pct"] = df_work["proporsi_fomo_pct"].replace([np.inf, -np.inf], np.nan)
+
+    if "fomo_num" not in df_work.columns:
+        df_work["fomo_num"] = _angka(df_work, kolom["freq_fomo"])
+
+    col_kesejahteraan_explicit = kolom["kesejahteraan_explicit"]
+    if col_kesejahteraan_explicit and col_kesejahteraan_explicit in df_work.columns:
+        df_work["kesejahteraan_score"] = pd.to_numeric(df_work[col_kesejahteraan_explicit], errors="coerce")
+    else:
+        distress_cols = [c for c in [kolom["distress_1"], kolom["distress_2"], kolom["distress_3"], kolom["distress_4"]]
+                         if c and c in df_work.columns]
+        if distress_cols:
+            df_work["mean_distress"] = df_work[distress_cols].mean(axis=1)
+            df_work["kesejahteraan_score"] = 6 - df_work["mean_distress"]
+        else:
+            df_work["kesejahteraan_score"] = np.nan
+
+    return compact(df_work, kolom)
+
+
+def pilih_fomo(df_work, fomo_angka=None):
+    """Pilih skor FOMO final untuk seluruh frame; kembalikan (frame baru, fomo_angka).
+
+    Tahap wajib setelah derive pada frame gabungan semua blok: kolom sementara _fomo_angka
+    dibuang di sini. Jika hampir tidak ada jawaban FOMO yang cocok dengan mapping teks, kolom
+    itu berisi angka. Pada mode append keputusan dari build penuh (fomo_angka) dipakai ulang
+    agar konsisten.
+    """
+    if "_fomo_angka" not in df_work.columns:
+        return df_work, bool(fomo_angka)
+    if fomo_angka is None:
+        fomo_angka = bool(df_work["fomo_num"].notna().sum() < len(df_work)*0.1)
+    angka = df_work["_fomo_angka"]
+    df_work = df_work.drop(columns="_fomo_angka")
+    if fomo_angka:
+        df_work["fomo_num"] = angka
+    return df_work, fomo_angka
@@ -0,0 +1,181 @@
+# bench_pipeline.py
+# Benchmark skala tiap tahap dashboard di atas survei sintetis + deteksi regresi per commit
+#
+# Jalankan dari root repo:
+#   python benchmarks/bench_pipeline.py                         # 10 ribu & 1 juta baris
+#   python benchmarks/bench_pipeline.py --rows 10000000 --ulang 1
+#   python benchmarks/bench_pipeline.py --toleransi 1.3 --no-history
+#
+# Tahap yang diukur sama dengan jalur build_from_csv + render dashboard: load (baca CSV
+# per blok), clean, derive (termasuk gabung blok dan select_fomo), aggregate (binning +
+# kubus) dicatat oleh build_from_csv sendiri lewat rekaman instrumen; crosstab
+# (frekuensi & kontingensi dari kubus), filter (indeks bitmap + mask), korelasi, dan
+# figure (semua builder grafik → JSON Plotly). Angka terbaik dari --ulang percobaan
+# ditambahkan ke benchmarks/pipeline_history.jsonl; tahap yang lebih lambat dari
+# --toleransi kali pengukuran commit sebelumnya (ukuran sama) dilaporkan sebagai regresi
+# dan skrip keluar dengan kode 1.
+
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from analitik import build_from_csv
+from analitik.agregasi import DIMENSI_KUBUS, contingency, frekuensi
+from analitik.filter_silang import bangun_indeks, mask_filter
+from analitik.instrumen import rekaman_baru
+from analitik.korelasi import correlation_matrices
+from analitik.tren import ember_harian, tabel_tren
+from bench_startup import git_commit
+from sintetis import siapkan
+
+HISTORY = os.path.join(ROOT, "benchmarks", "pipeline_history.jsonl")
+ROWS = [10_000, 1_000_000]
+TOLERANSI = 1.25
+# Selisih di bawah ini dianggap derau pengukuran, bukan regresi
+MIN_SELISIH_MS = 20.0
+TAHAP = ["load", "clean", "derive", "aggregate", "crosstab", "filter", "korelasi", "figure"]
+
+
+def _build(path):
+    # build_from_csv apa adanya; waktu tahap load/clean/derive/aggregate dijumlahkan dari
+    # catatan per blok di rekaman
+    rekaman = rekaman_baru()
+    df_work, info = build_from_csv(path, rekaman)
+    waktu = dict.fromkeys(["load", "clean", "derive", "aggregate"], 0.0)
+    for catatan in rekaman["tahap"]:
+        waktu[catatan["tahap"]] += catatan["ms"] / 1000
+    return df_work, info, waktu
+
+
+def _crosstab(ringkasan):
+    for dim in DIMENSI_KUBUS:
+        frekuensi(ringkasan, dim)
+    for i, a in enumerate(DIMENSI_KUBUS):
+        for b in DIMENSI_KUBUS[i + 1:]:
+            contingency(ringkasan, a, b)
+
+
+def _filter(df_work, kolom):
+    kolom_filter = {"fakultas": "fakultas_clean", "program_studi": kolom["program_studi"],
+                    "fomo": kolom["fomo_text"]}
+    indeks = bangun_indeks(df_work, kolom_filter, "waktu")
+    # Dua fakultas (OR dalam grup) dan satu jawaban FOMO (AND antar-grup)
+    pilihan = {nama: tuple(indeks["grup"][nama]["nilai"][:k])
+               for nama, k in (("fakultas", 2), ("fomo", 1)) if nama in indeks["grup"]}
+    return mask_filter(indeks, pilihan)
+
+
+def _figure(df_work, kolom, ringkasan, korelasi):
+    import plotly.io as pio
+    from grafik import FIGURE_BUILDERS
+
+    ember = ember_harian(df_work)
+    tampilan = {"df_work": df_work, "mask": None, "ringkasan": ringkasan,
+                "fomo_text": kolom["fomo_text"], "korelasi": lambda: korelasi,
+                "tren": lambda jendela: tabel_tren(ember, jendela)}
+    total = 0
+    for builder in FIGURE_BUILDERS.values():
+        fig = builder(tampilan)
+        if fig is not None:
+            total += len(pio.to_json(fig, validate=False))
+    return total
+
+
+def _ukur(fn):
+    t0 = time.perf_counter()
+    hasil = fn()
+    return time.perf_counter() - t0, hasil
+
+
+def ukur_ukuran(path, ulang):
+    """Waktu terbaik (detik) per tahap untuk satu file CSV."""
+    # Impor backend plot tidak ikut diukur (dibayar sekali per proses, lihat bench_startup.py)
+    import plotly.express  # noqa: F401
+    import plotly.graph_objects  # noqa: F401
+
+    terbaik = {}
+    for _ in range(ulang):
+        df_work, info, waktu = _build(path)
+        kolom, ringkasan = info["kolom"], info["ringkasan"]
+        waktu["crosstab"], _ = _ukur(lambda: _crosstab(ringkasan))
+        waktu["filter"], _ = _ukur(lambda: _filter(df_work, kolom))
+        waktu["korelasi"], korelasi = _ukur(lambda: correlation_matrices(df_work))
+        waktu["figure"], ukuran_json = _ukur(lambda: _figure(df_work, kolom, ringkasan, korelasi))
+        for tahap, detik in waktu.items():
+            terbaik[tahap] = min(detik, terbaik.get(tahap, detik))
+        df_work = None  # lepaskan frame sebelum percobaan berikutnya membangun ulang
+    return terbaik, ukuran_json
+
+
+def _riwayat_terakhir(rows, commit):
+    # Pengukuran terakhir untuk ukuran yang sama dari commit lain (pembanding regresi)
+    if not os.path.exists(HISTORY):
+        return None
+    pembanding = None
+    with open(HISTORY, encoding="utf-8") as f:
+        for baris in f:
+            rec = json.loads(baris)
+            if rec["rows"] == rows and rec["commit"] != commit:
+                pembanding = rec
+    return pembanding
+
+
+def regresi(waktu_ms, pembanding, toleransi):
+    """Daftar (tahap, ms sekarang, ms pembanding) yang melambat melebihi toleransi."""
+    if pembanding is None:
+        return []
+    lambat = []
+    for tahap, ms in waktu_ms.items():
+        lama = pembanding["tahap_ms"].get(tahap)
+        if lama is not None and ms > lama * toleransi and ms - lama > MIN_SELISIH_MS:
+            lambat.append((tahap, ms, lama))
+    return lambat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=ROWS)
+    parser.add_argument("--ulang", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--toleransi", type=float, default=TOLERANSI)
+    parser.add_argument("--no-history", action="store_true")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    semua_regresi = []
+    for rows in args.rows:
+        path = siapkan(rows, args.seed)
+        terbaik, ukuran_json = ukur_ukuran(path, args.ulang)
+        waktu_ms = {tahap: round(terbaik[tahap] * 1000, 1) for tahap in TAHAP}
+        pembanding = _riwayat_terakhir(rows, commit)
+        lambat = regresi(waktu_ms, pembanding, args.toleransi)
+
+        print(f"{rows:,} baris ({os.path.getsize(path) / 1e6:.0f} MB CSV, JSON grafik {ukuran_json / 1e3:.0f} KB)")
+        for tahap in TAHAP:
+            ms = waktu_ms[tahap]
+            lama = pembanding["tahap_ms"].get(tahap) if pembanding else None
+            banding = f"  (sebelumnya {lama:.1f} ms @ {pembanding['commit']})" if lama is not None else ""
+            tanda = "  REGRESI" if any(t == tahap for t, _, _ in lambat) else ""
+            print(f"  {tahap:<10} {ms:10.1f} ms  {rows / max(ms, 1e-3) / 1e3:8.2f} juta baris/s{banding}{tanda}")
+        semua_regresi += [(rows, *r) for r in lambat]
+
+        if not args.no_history:
+            with open(HISTORY, "a", encoding="utf-8") as f:
+                f.write(json.dumps({
+                    "waktu": datetime.datetime.now().isoformat(timespec="seconds"),
+                    "commit": commit,
+                    "python": sys.version.split()[0],
+                    "rows": rows,
+                    "tahap_ms": waktu_ms,
+                    "json_grafik_bytes": ukuran_json,
+                }) + "\n")
+
+    for rows, tahap, ms, lama in semua_regresi:
+        print(f"Regresi {tahap} @ {rows:,} baris: {lama:.1f} → {ms:.1f} ms (toleransi {args.toleransi}x)")
+    sys.exit(1 if semua_regresi else 0)
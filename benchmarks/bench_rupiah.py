@@ -0,0 +1,66 @@
+# bench_rupiah.py
+# Benchmark parser Rupiah: apply per baris (lama) vs parse_rupiah (vektor)
+#
+# Jalankan dari root repo:  python benchmarks/bench_rupiah.py [jumlah_baris]
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analitik.rupiah import parse_rupiah
+
+
+def rupiah_to_num_lama(x):
+    # Implementasi lama dari eda.py, dipertahankan hanya sebagai pembanding
+    try:
+        if pd.isna(x):
+            return np.nan
+        s = str(x)
+        s = s.replace("Rp", "").replace("rp", "").replace(",", "").replace(".", "").strip()
+        return float(s) if s not in ["", "-"] else np.nan
+    except:
+        return np.nan
+
+
+def kolom_sintetis(n, seed=0, unik=False):
+    # Campuran format yang muncul di ekspor survei: "2000000.0", "Rp 1.500.000", "1,250,000", kosong.
+    # unik=True: hampir semua nominal berbeda (kasus terburuk untuk factorize)
+    rng = np.random.default_rng(seed)
+    if unik:
+        nominal = rng.permutation(n) * 7 + 10_000
+    else:
+        nominal = rng.integers(1, 100, size=n) * 50_000
+    bentuk = rng.integers(0, 4, size=n)
+    out = np.empty(n, dtype=object)
+    out[bentuk == 0] = [f"{v}.0" for v in nominal[bentuk == 0]]
+    out[bentuk == 1] = [f"Rp {v:,}".replace(",", ".") for v in nominal[bentuk == 1]]
+    out[bentuk == 2] = [f"{v:,}" for v in nominal[bentuk == 2]]
+    out[bentuk == 3] = None
+    return pd.Series(out)
+
+
+def ukur(label, fn, s, ulang=3):
+    terbaik = min(_waktu(fn, s) for _ in range(ulang))
+    print(f"{label:<28} {terbaik:8.3f} s   {len(s) / terbaik / 1e6:8.2f} juta baris/s")
+    return terbaik
+
+
+def _waktu(fn, s):
+    t0 = time.perf_counter()
+    fn(s)
+    return time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    s = kolom_sintetis(n)
+    print(f"Kolom sintetis: {n:,} baris")
+    t_lama = ukur("apply(rupiah_to_num)", lambda x: x.apply(rupiah_to_num_lama), s, ulang=1)
+    t_baru = ukur("parse_rupiah (teks)", parse_rupiah, s)
+    ukur("parse_rupiah (teks, unik)", parse_rupiah, kolom_sintetis(n, unik=True))
+    ukur("parse_rupiah (float64)", parse_rupiah, pd.Series(np.arange(n, dtype="float64")))
+    print(f"Percepatan: {t_lama / t_baru:.1f}x")
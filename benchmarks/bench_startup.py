@@ -0,0 +1,90 @@
+# bench_startup.py
+# Anggaran waktu impor dashboard (python -X importtime) + riwayat per commit
+#
+# Jalankan dari root repo:  python benchmarks/bench_startup.py [--budget-ms 1200]
+#
+# Mengukur impor tingkat-atas eda.py (yang dibayar setiap proses skrip) dan, sebagai
+# pembanding, backend plot yang dimuat malas saat grafik pertama dibangun. Setiap
+# pengukuran ditambahkan ke benchmarks/startup_history.jsonl agar tren bisa dipantau.
+
+import argparse
+import ast
+import datetime
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY = os.path.join(ROOT, "benchmarks", "startup_history.jsonl")
+BUDGET_MS = 1200
+
+# Dimuat hanya ketika grafik pertama dibangun (lihat builder di grafik.py)
+LAZY = ["plotly.express", "plotly.graph_objects", "plotly.io"]
+
+
+def top_level_imports(path):
+    tree = ast.parse(open(path, encoding="utf-8").read())
+    mods = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            mods += [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            mods.append(node.module)
+    return mods
+
+
+def importtime(mods):
+    """Total waktu impor (ms) dan 10 modul termahal, dari satu proses Python baru."""
+    code = "; ".join(f"import {m}" for m in mods)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        rows.append((name[1:].rstrip(), int(self_us), int(cum_us)))
+    # Modul tingkat-atas (tanpa indentasi) sudah mencakup seluruh subimpornya
+    total_us = sum(cum for name, _, cum in rows if not name.startswith(" "))
+    terberat = sorted(rows, key=lambda r: r[2], reverse=True)[:10]
+    return total_us / 1000, [(name.strip(), cum / 1000) for name, _, cum in terberat]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--no-history", action="store_true")
+    args = parser.parse_args()
+
+    app_mods = top_level_imports(os.path.join(ROOT, "eda.py"))
+    app_ms, terberat = importtime(app_mods)
+    lazy_ms, _ = importtime(LAZY)
+
+    print(f"Impor eda.py ({', '.join(app_mods)}): {app_ms:.0f} ms (anggaran {args.budget_ms:.0f} ms)")
+    for name, ms in terberat:
+        print(f"  {ms:8.1f} ms  {name}")
+    print(f"Backend plot (malas, saat grafik pertama): {lazy_ms:.0f} ms")
+
+    if not args.no_history:
+        with open(HISTORY, "a", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "waktu": datetime.datetime.now().isoformat(timespec="seconds"),
+                "commit": git_commit(),
+                "python": sys.version.split()[0],
+                "impor_ms": round(app_ms, 1),
+                "plot_malas_ms": round(lazy_ms, 1),
+            }) + "\n")
+
+    sys.exit(0 if app_ms <= args.budget_ms else 1)
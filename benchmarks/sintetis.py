@@ -0,0 +1,97 @@
+# sintetis.py
+# Generator survei sintetis dengan skema yang sama persis dengan "Data Eda Threeasure_Updated.csv"
+#
+# Jalankan dari root repo:  python benchmarks/sintetis.py 1000000 [--out survei.csv] [--seed 0]
+#
+# Baris sampel di-resample utuh (sehingga hubungan antar-jawaban dan korelasi tetap
+# realistis), lalu timestamp disebar acak di rentang waktu sampel, nominal uang dikali
+# faktor acak (kardinalitas nominal ikut tumbuh seperti data asli), dan kolom identitas
+# dibuat unik per baris. File ditulis per blok, jadi 10 juta baris tidak perlu muat di memori.
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from analitik import DATA_PATH
+from analitik.skema import FORMAT_WAKTU
+
+DATA_DIR = os.path.join(ROOT, "benchmarks", "data")
+BLOK_BARIS = 500_000
+
+KOLOM_UANG = ["rata-rata_uang_saku_perbulan", "pengeluaran_untuk_fomo_per_bulan"]
+# Faktor pengali nominal; uang saku & pengeluaran satu responden dikali faktor yang sama
+FAKTOR_UANG = np.array([0.5, 0.75, 0.9, 1.0, 1.1, 1.25, 1.5, 2.0])
+
+
+def _sampel(path=DATA_PATH):
+    # Semua kolom dibaca sebagai teks supaya nilai ditulis ulang persis seperti aslinya
+    sampel = pd.read_csv(path, dtype=str, keep_default_na=False)
+    waktu = pd.to_datetime(sampel["timestamp"], format=FORMAT_WAKTU)
+    return sampel, waktu.min(), waktu.max()
+
+
+def _format_waktu(waktu):
+    # FORMAT_WAKTU tanpa nol di depan bulan/hari/jam (mis. "9/10/2025 8:05:31"), seperti ekspor Google Form
+    w = pd.Series(waktu)
+    return (w.dt.month.astype(str) + "/" + w.dt.day.astype(str) + "/" + w.dt.year.astype(str) + " "
+            + w.dt.hour.astype(str) + ":" + w.dt.strftime("%M:%S"))
+
+
+def buat_blok(sampel, mulai, selesai, n, rng, offset=0):
+    """Satu DataFrame sintetis n baris (nomor responden mulai dari offset)."""
+    blok = sampel.iloc[rng.integers(0, len(sampel), size=n)].reset_index(drop=True)
+
+    detik = rng.integers(0, int((selesai - mulai).total_seconds()) + 1, size=n)
+    blok["timestamp"] = _format_waktu(mulai + pd.to_timedelta(detik, unit="s")).to_numpy()
+
+    faktor = rng.choice(FAKTOR_UANG, size=n)
+    for c in KOLOM_UANG:
+        nominal = pd.to_numeric(blok[c], errors="coerce").to_numpy()
+        blok[c] = np.round(nominal * faktor / 5_000) * 5_000
+
+    nomor = pd.Series(np.arange(offset, offset + n)).astype(str).str.zfill(8)
+    blok["nama_lengkap"] = "Responden " + nomor
+    blok["npm"] = "99" + nomor
+    blok["no_whatshapp"] = "8" + nomor
+    blok["email_address"] = "99" + nomor + "@student.upnjatim.ac.id"
+    return blok
+
+
+def tulis_csv(path, n, seed=0, blok_baris=BLOK_BARIS):
+    """Tulis survei sintetis n baris ke path (per blok) dan kembalikan path."""
+    sampel, mulai, selesai = _sampel()
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for offset in range(0, max(n, 1), blok_baris):
+            jumlah = min(blok_baris, n - offset)
+            blok = buat_blok(sampel, mulai, selesai, jumlah, rng, offset)
+            blok.to_csv(f, index=False, header=offset == 0)
+    return path
+
+
+def path_sintetis(n, seed=0):
+    return os.path.join(DATA_DIR, f"survei_{n}_{seed}.csv")
+
+
+def siapkan(n, seed=0):
+    """Path CSV sintetis n baris; dibuat sekali lalu dipakai ulang oleh benchmark berikutnya."""
+    path = path_sintetis(n, seed)
+    if not os.path.exists(path):
+        tulis_csv(path, n, seed)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("rows", type=int)
+    parser.add_argument("--out")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    out = tulis_csv(args.out or path_sintetis(args.rows, args.seed), args.rows, args.seed)
+    print(f"{args.rows:,} baris → {out} ({os.path.getsize(out) / 1e6:.1f} MB)")
@@ -1,13 +1,21 @@
 # dashboard_threeasure_full.py
-# Dashboard Threeasure (3 Halaman)
+# Dashboard Threeasure (4 Halaman)
+
+import json
+import os
 
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-import seaborn as sns
-import matplotlib.pyplot as plt
+
+from analitik.agregasi import basis_ringkasan, frekuensi, iris, rata_rata, ringkas_basis
+from analitik.filter_silang import bangun_indeks, hitung_grup, mask_filter, opsi_tersedia, rentang_waktu
+from grafik import FIGURE_BUILDERS, METODE_KORELASI
+from analitik.insight import interpretasi_fomo_kesejahteraan, nilai_ci_kpi, nilai_kpi, susun_insight, teks_uji
+from analitik.instrumen import ke_jsonl, rekaman_baru, selesai, tahap, tulis_jsonl, ukur_memori
+from analitik.korelasi import correlation_matrices
+from analitik.statistik import ci_kpi, uji_kontingensi
+from analitik.tren import ember_harian, potong_ember, tabel_tren
+from analitik import DATA_PATH, KolomTidakDikenali, load_df, memory_report, source_fingerprint
 
 # ---------------------------
 # Page config
@@ -15,10 +23,63 @@ import matplotlib.pyplot as plt
 st.set_page_config(page_title="Threeasure — Dashboard FOMO & Kesejahteraan", layout="wide")
 
 # ---------------------------
-# Color Palette
+# Instrumentasi
 # ---------------------------
-PALET_WARNA = ["#FDA19B", "#E47A7B", "#CB5D66", "#B14454", "#982E46", "#7F1D3A", "#660F2F"]
+# Waktu, puncak memori, dan ukuran payload setiap tahap rerun ini. Riwayat rerun disimpan
+# per sesi; THREEASURE_INSTRUMEN_LOG (opsional) menambahkan setiap rerun sebagai satu
+# baris JSON ke file tersebut untuk monitoring.
+rekaman = rekaman_baru()
+RIWAYAT_INSTRUMEN = 50
+LOG_INSTRUMEN = os.environ.get("THREEASURE_INSTRUMEN_LOG")
+
+
+def _admin_aktif():
+    # Panel admin hanya untuk operator (THREEASURE_ADMIN=1 atau `admin = true` di
+    # .streamlit/secrets.toml), bukan lewat URL: tracemalloc berlaku untuk seluruh proses
+    if os.environ.get("THREEASURE_ADMIN") == "1":
+        return True
+    try:
+        return bool(st.secrets.get("admin", False))
+    except FileNotFoundError:
+        return False
+
+
+ADMIN = _admin_aktif()
+
+
+def catat_rerun(df_work=None):
+    # Tutup rekaman rerun ini (riwayat sesi + log JSONL), lalu tampilkan panel admin
+    riwayat = st.session_state.setdefault("instrumen", [])
+    riwayat.append(selesai(rekaman))
+    del riwayat[:-RIWAYAT_INSTRUMEN]
+    if LOG_INSTRUMEN:
+        tulis_jsonl(LOG_INSTRUMEN, rekaman)
+    if not ADMIN:
+        return
+    with st.sidebar.expander("🛠️ Instrumentasi"):
+        # tracemalloc berlaku untuk seluruh proses; hanya diubah saat kotak ini diklik
+        st.checkbox("Ukur puncak memori (tracemalloc)", key="ukur_memori",
+                    on_change=lambda: ukur_memori(st.session_state["ukur_memori"]))
+        st.caption(f"Rerun terakhir: {rekaman['total_ms']:.0f} ms")
+        st.dataframe(pd.DataFrame(rekaman["tahap"]), hide_index=True)
+        st.markdown("**Riwayat rerun sesi ini**")
+        st.dataframe(pd.DataFrame(riwayat).drop(columns="tahap"), hide_index=True)
+        st.download_button("Unduh JSONL", ke_jsonl(riwayat), file_name="instrumen.jsonl",
+                           mime="application/jsonl")
+        if df_work is not None:
+            st.markdown("**Memori df_work per kolom**")
+            st.dataframe(memory_report(df_work))
+
+
+def berhenti(df_work=None):
+    # st.stop() yang tetap mencatat rerun ini. Pencatatan harus sebelum stop: setelah stop
+    # diminta, pemanggilan st berikutnya (termasuk session_state) langsung menghentikan skrip
+    catat_rerun(df_work)
+    st.stop()
 
+# ---------------------------
+# Color Palette (palet grafik: PALET_WARNA di grafik.py)
+# ---------------------------
 PRIMARY = "#7F1D3A"
 SECONDARY = "#B14454"
 ACCENT = "#E47A7B"
@@ -65,110 +126,105 @@ st.markdown(f"""
 </style>
 """, unsafe_allow_html=True)
 
-# ---------------------------
-# Load data
-# ---------------------------
-@st.cache_data
-def load_df(path="Data Eda Threeasure_Updated.csv"):
-    return pd.read_csv(path)
+@st.cache_resource(max_entries=2, show_spinner="Memproses data...")
+def build_work_frame(source_fingerprint):
+    # Seluruh preprocessing dijalankan sekali per versi file, bukan per rerun.
+    # st.cache_resource menyimpan satu objek per proses yang dipakai bersama (read-only)
+    # oleh semua sesi tanpa disalin; state per sesi hanya pilihan filter & navigasi.
+    # Karena itu df_work dan ringkasan tidak boleh diubah di tempat oleh kode dashboard:
+    # subset dibuat lewat mask/iris, kolom turunan baru ditambahkan di analitik.
+    return load_df(source_fingerprint)
+
+# Sumber data: CSV survei (bawaan) atau basis data SQLite berisi gelombang survei
+# (.db/.sqlite, diisi lewat `python -m analitik.basisdata`), dipilih lewat THREEASURE_DATA
+SUMBER_DATA = os.environ.get("THREEASURE_DATA", DATA_PATH)
 
 try:
-    df = load_df()
+    DATA_VERSION = source_fingerprint(SUMBER_DATA)
+    with tahap(rekaman, "load_df"):
+        df_work, kolom, ringkasan = build_work_frame(DATA_VERSION)
 except FileNotFoundError:
-    st.error("File data tidak ditemukan. Pastikan file 'Data Eda Threeasure_Updated.csv' ada.")
-    st.stop()
+    st.error(f"File data tidak ditemukan. Pastikan file '{SUMBER_DATA}' ada.")
+    berhenti()
+except KolomTidakDikenali as e:
+    # Header tidak bisa dipetakan ke peran analitik (mis. kolom ambigu, lihat skema.resolve_kolom)
+    st.error(f"Struktur kolom '{SUMBER_DATA}' tidak dikenali: {e}")
+    berhenti()
+
+col_fomo_text = kolom["fomo_text"]
 
 # ---------------------------
-# Column Mapping & Preprocessing
+# Figure builders & cache
 # ---------------------------
-cols = [c.lower().strip() for c in df.columns]
-colmap = {c.lower().strip(): c for c in df.columns}
-
-def find_col(keywords):
-    for k in keywords:
-        for key in colmap:
-            if k.lower() in key:
-                return colmap[key]
-    return None
-
-# Column detection
-col_fakultas = find_col(["fakultas"])
-col_uang_saku = find_col(["uang", "saku"]) or find_col(["x1"])
-col_pengeluaran_fomo = find_col(["pengeluaran", "fomo"]) or find_col(["x2"])
-col_kemampuan = find_col(["kemampuan", "mengelola", "keuangan"]) or find_col(["x3"])
-col_fomo_text = find_col(["sering_merasa_fomo", "sering merasa fomo", "fomo"])
-col_freq_fomo = find_col(["frekuensi", "tingkat", "skor", "x4"])
-col_kesejahteraan_explicit = find_col(["kesejahteraan_psikologis", "kesejahteraan"])
-col_distress_1 = find_col(["pengaruh_emosi", "emosi", "x5"])
-col_distress_2 = find_col(["frekuensi_stres_fin", "stres_fin", "x6"])
-col_distress_3 = find_col(["hilang_semangat", "hilang semangat", "x7"])
-col_distress_4 = find_col(["frekuensi_stres_fomo", "stres_fomo", "x8"])
-
-def rupiah_to_num(x):
-    try:
-        if pd.isna(x):
-            return np.nan
-        s = str(x)
-        s = s.replace("Rp", "").replace("rp", "").replace(",", "").replace(".", "").strip()
-        return float(s) if s not in ["", "-"] else np.nan
-    except:
-        return np.nan
-
-df_work = df.copy()
-
-if col_uang_saku in df_work.columns:
-    df_work["uang_saku_num"] = df_work[col_uang_saku].apply(rupiah_to_num)
-else:
-    df_work["uang_saku_num"] = np.nan
-
-if col_pengeluaran_fomo in df_work.columns:
-    df_work["pengeluaran_fomo_num"] = df_work[col_pengeluaran_fomo].apply(rupiah_to_num)
-else:
-    df_work["pengeluaran_fomo_num"] = np.nan
-
-df_work["proporsi_fomo_pct"] = (df_work["pengeluaran_fomo_num"] / df_work["uang_saku_num"]) * 100
-df_work["proporsi_fomo_pct"].replace([np.inf, -np.inf], np.nan, inplace=True)
-
-def safe_numeric(col):
-    if col and col in df_work.columns:
-        return pd.to_numeric(df_work[col], errors="coerce")
-    else:
-        return pd.Series([np.nan]*len(df_work), index=df_work.index)
-
-# FOMO mapping
-if col_fomo_text and col_fomo_text in df_work.columns:
-    mapping = {"tidak": 1, "tidak pernah":1, "ya":5, "sering":4, "sangat sering":5,
-               "kadang-kadang":3, "kadang":3, "jarang":2, "jarang sekali":2}
-    series = df_work[col_fomo_text].astype(str).str.strip().str.lower()
-    mapped = series.map(lambda v: mapping.get(v, np.nan))
-    if mapped.notna().sum() >= len(df_work)*0.1:
-        df_work["fomo_num"] = mapped
-    else:
-        parsed = pd.to_numeric(series, errors="coerce")
-        df_work["fomo_num"] = parsed
-else:
-    possible = find_col(["frekuensi", "tingkat", "skor", "x4"])
-    df_work["fomo_num"] = safe_numeric(possible)
-
-# Kesejahteraan
-if col_kesejahteraan_explicit and col_kesejahteraan_explicit in df_work.columns:
-    df_work["kesejahteraan_score"] = pd.to_numeric(df_work[col_kesejahteraan_explicit], errors="coerce")
-else:
-    distress_cols = [c for c in [col_distress_1, col_distress_2, col_distress_3, col_distress_4] if c and c in df_work.columns]
-    if distress_cols:
-        for c in distress_cols:
-            df_work[c] = pd.to_numeric(df_work[c], errors="coerce")
-        df_work["mean_distress"] = df_work[distress_cols].mean(axis=1)
-        df_work["kesejahteraan_score"] = 6 - df_work["mean_distress"]
-    else:
-        df_work["kesejahteraan_score"] = np.nan
-
-df_work["kemampuan_num"] = safe_numeric(col_kemampuan)
+# Setiap grafik dibangun oleh satu fungsi murni di grafik.py (tampilan, **params) -> Figure.
+# Hasilnya disimpan sebagai JSON Plotly per (versi data, id grafik, parameter),
+# sehingga banyak viewer dengan tampilan yang sama hanya membayar satu kali build.
+FIGURE_CACHE_MAX = 64
+# Pilihan jendela (hari) rata-rata bergulir di Halaman 4
+JENDELA_TREN = [1, 3, 7]
+
+@st.cache_data(max_entries=FIGURE_CACHE_MAX, show_spinner=False)
+def tabel_korelasi(data_version, pilihan, _df_work, _mask):
+    # Pearson + Spearman dihitung bersama, sekali per versi data dan kombinasi filter
+    return correlation_matrices(_df_work, mask=_mask)
+
+def korelasi_aktif():
+    with tahap(rekaman, "korelasi"):
+        return tabel_korelasi(DATA_VERSION, pilihan, df_work, mask_aktif)
+
+@st.cache_data(max_entries=FIGURE_CACHE_MAX, show_spinner=False)
+def ember_tren(data_version, pilihan_tanpa_waktu, _df_work, _indeks):
+    # Ember harian per versi data dan filter selain waktu; rentang waktu sidebar cukup
+    # mengiris ember ini (potong_ember), tanpa memindai ulang baris
+    return ember_harian(_df_work, mask_filter(_indeks, pilihan_tanpa_waktu))
+
+def tren_aktif(jendela):
+    with tahap(rekaman, "tren"):
+        pilihan_tanpa_waktu = {k: v for k, v in pilihan.items() if k != "waktu"}
+        ember = ember_tren(DATA_VERSION, pilihan_tanpa_waktu, df_work, indeks)
+        return tabel_tren(potong_ember(ember, *pilihan.get("waktu", (None, None))), jendela)
+
+def tampilan_aktif():
+    # Input builder grafik untuk data & filter sidebar saat ini (lihat grafik.py)
+    return {
+        "df_work": df_work,
+        "mask": mask_aktif,
+        "ringkasan": ringkasan,
+        "fomo_text": col_fomo_text,
+        "korelasi": korelasi_aktif,
+        "tren": tren_aktif,
+    }
 
-if col_fakultas and col_fakultas in df_work.columns:
-    df_work["fakultas_clean"] = df_work[col_fakultas].astype(str).str.strip()
-else:
-    df_work["fakultas_clean"] = "Unknown"
+@st.cache_data(max_entries=FIGURE_CACHE_MAX, show_spinner=False)
+def figure_json(data_version, pilihan, chart_id, params, _tampilan):
+    import plotly.io as pio
+    # _tampilan tidak di-hash (diawali underscore); versi datanya diwakili data_version
+    # dan subset barisnya oleh pilihan filter sidebar.
+    # max_entries membatasi jumlah grafik tersimpan; entri yang paling lama tidak dipakai dibuang duluan.
+    fig = FIGURE_BUILDERS[chart_id](_tampilan, **params)
+    return None if fig is None else pio.to_json(fig, validate=False)
+
+def render_figure(chart_id, **params):
+    with tahap(rekaman, f"grafik:{chart_id}") as catatan:
+        spec = figure_json(DATA_VERSION, pilihan, chart_id, params, tampilan_aktif())
+        if spec is None:
+            return False
+        catatan["bytes"] = len(spec)
+        st.plotly_chart(json.loads(spec), use_container_width=True)
+    return True
+
+def kartu_insight(teks, warna, judul="Insight"):
+    # Kartu insight Halaman 2; teks None berarti data (setelah filter) tidak cukup
+    if teks:
+        st.markdown(f"""
+        <div class="card" style="background:{warna}; color:#660F2F;">
+            💡 <b>{judul}:</b> {teks}
+        </div>
+        """, unsafe_allow_html=True)
+
+def ada_data(nama):
+    # Ada responden dengan nilai terisi pada dimensi kubus ini (setelah filter)
+    return frekuensi(ringkasan, nama).sum() > 0
 
 # ================================
 # Sidebar Navigasi Halaman
@@ -176,8 +232,80 @@ else:
 page = st.sidebar.radio("📑 Navigasi", [
     "Halaman 1 - Dataset & KPI",
     "Halaman 2 - Visualisasi Data",
-    "Halaman 3 - Kesimpulan"
+    "Halaman 3 - Kesimpulan",
+    "Halaman 4 - Tren Waktu"
 ])
+rekaman["halaman"] = page
+
+# ================================
+# Sidebar Filter (berlaku untuk semua halaman)
+# ================================
+# Indeks bitmap dibangun sekali per versi data dan dipakai bersama (read-only) oleh semua
+# sesi. Perubahan filter hanya menggabungkan bitmap lalu meringkas ulang array kode/nilai
+# yang sudah disiapkan; df_work tidak dipindai ulang maupun disalin.
+KOLOM_FILTER = {"fakultas": "fakultas_clean", "program_studi": kolom["program_studi"], "fomo": col_fomo_text}
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def indeks_filter(data_version, _df_work):
+    return bangun_indeks(_df_work, KOLOM_FILTER, "waktu"), basis_ringkasan(_df_work)
+
+@st.cache_data(max_entries=FIGURE_CACHE_MAX, show_spinner=False)
+def terapkan_filter(data_version, pilihan, _indeks, _basis, _ringkasan):
+    mask = mask_filter(_indeks, pilihan)
+    if mask is None:
+        return None, None
+    if set(pilihan) <= {"fakultas"}:
+        # Fakultas adalah sumbu kubus: cukup diiris, tanpa menyentuh data per baris
+        return mask, iris(_ringkasan, fakultas=pilihan["fakultas"])
+    return mask, ringkas_basis(_basis, mask)
+
+with tahap(rekaman, "indeks_filter"):
+    indeks, basis = indeks_filter(DATA_VERSION, df_work)
+st.sidebar.markdown("### 🔎 Filter Responden")
+pilihan = {}
+if "fakultas" in indeks["grup"]:
+    pilihan["fakultas"] = tuple(st.sidebar.multiselect(
+        "Fakultas", indeks["grup"]["fakultas"]["nilai"], placeholder="Semua fakultas"))
+if "program_studi" in indeks["grup"]:
+    # Pilihan program studi menyempit mengikuti fakultas yang dipilih (filter silang)
+    prodi_opsi = opsi_tersedia(indeks, "program_studi", mask_filter(indeks, pilihan))
+    pilihan["program_studi"] = tuple(st.sidebar.multiselect(
+        "Program studi", prodi_opsi, placeholder="Semua program studi"))
+if "fomo" in indeks["grup"]:
+    fomo_pilih = st.sidebar.radio("Merasa FOMO", ["Semua"] + indeks["grup"]["fomo"]["nilai"], horizontal=True)
+    pilihan["fomo"] = () if fomo_pilih == "Semua" else (fomo_pilih,)
+rentang = rentang_waktu(indeks)
+if rentang:
+    tanggal = st.sidebar.date_input("Rentang waktu pengisian", value=rentang,
+                                    min_value=rentang[0], max_value=rentang[1])
+    # Selama baru satu tanggal diklik, date_input mengembalikan satu elemen saja
+    if len(tanggal) == 2 and tuple(tanggal) != rentang:
+        pilihan["waktu"] = tuple(tanggal)
+# Filter kosong tidak ikut kunci cache, sehingga tampilan tanpa filter berbagi entri yang sama
+pilihan = {k: v for k, v in pilihan.items() if v}
+
+with tahap(rekaman, "terapkan_filter"):
+    mask_aktif, ringkasan_filter = terapkan_filter(DATA_VERSION, pilihan, indeks, basis, ringkasan)
+if mask_aktif is not None:
+    ringkasan = ringkasan_filter
+    st.sidebar.caption(f"Menampilkan {ringkasan['n']} dari {len(df_work)} responden")
+    if ringkasan["n"] == 0:
+        st.warning("Tidak ada responden yang cocok dengan filter. Longgarkan filter di sidebar.")
+        berhenti(df_work)
+
+@st.cache_data(max_entries=FIGURE_CACHE_MAX, show_spinner=False)
+def teks_insight(data_version, pilihan, _ringkasan, _indeks, _mask, _df_work):
+    # Insight & kesimpulan diturunkan dari agregat yang sama dengan grafik (kubus, jumlah
+    # jawaban FOMO dari indeks filter, matriks korelasi yang sudah di-cache), sekali per
+    # versi data dan kombinasi filter; angka di teks selalu sesuai dengan data terbaru.
+    jawaban = hitung_grup(_indeks, "fomo", _mask) if "fomo" in _indeks["grup"] else None
+    return susun_insight(_ringkasan, jawaban, tabel_korelasi(data_version, pilihan, _df_work, _mask))
+
+@st.cache_data(max_entries=FIGURE_CACHE_MAX, show_spinner=False)
+def statistik_uji(data_version, pilihan, _ringkasan, _basis, _mask):
+    # Uji χ² + Cramér's V per tabel kontingensi (dari kubus) dan CI bootstrap rata-rata KPI
+    # (dari nilai basis, subset mask), sekali per versi data dan kombinasi filter
+    return uji_kontingensi(_ringkasan), ci_kpi(_basis, _mask)
 
 # ================================
 # Halaman 1: Dataset & KPI
@@ -227,26 +355,18 @@ if page.startswith("Halaman 1"):
     # ---------------------------
     # KPI row
     # ---------------------------
-    total_n = len(df_work)
-    mean_uang_saku = df_work["uang_saku_num"].mean()
-    mean_pengeluaran_fomo = df_work["pengeluaran_fomo_num"].mean()
-    mean_kemampuan = df_work["kemampuan_num"].mean()
-    mean_kesejahteraan = df_work["kesejahteraan_score"].mean()
-    mean_proporsi = df_work["proporsi_fomo_pct"].mean()
-
-    def fmt_money(x):
-        if pd.isna(x):
-            return "-"
-        try:
-            return "Rp " + f"{int(round(x)):,}"
-        except:
-            return str(x)
-
-    val_uang = fmt_money(mean_uang_saku)
-    val_pengeluaran = fmt_money(mean_pengeluaran_fomo)
-    val_kemampuan = f"{mean_kemampuan:.2f}" if not pd.isna(mean_kemampuan) else "-"
-    val_kesejahteraan = f"{mean_kesejahteraan:.2f}" if not pd.isna(mean_kesejahteraan) else "-"
-    val_proporsi = f"{mean_proporsi:.1f}%" if not pd.isna(mean_proporsi) else "-"
+    total_n = ringkasan["n"]
+    kpi = nilai_kpi(ringkasan)
+    val_uang = kpi["uang_saku"]
+    val_pengeluaran = kpi["pengeluaran_fomo"]
+    val_kemampuan = kpi["kemampuan"]
+    val_kesejahteraan = kpi["kesejahteraan"]
+    val_proporsi = kpi["proporsi"]
+    with tahap(rekaman, "statistik"):
+        uji, ci = statistik_uji(DATA_VERSION, pilihan, ringkasan, basis, mask_aktif)
+        ci = nilai_ci_kpi(ci)
+        interpretasi = interpretasi_fomo_kesejahteraan(ringkasan, uji["fomo_kesejahteraan"])
+    ci_html = lambda kunci: f"<div class='small'>{ci[kunci]}</div>" if kunci in ci else ""
 
     # KPI Styling
     st.markdown("""
@@ -284,13 +404,13 @@ if page.startswith("Halaman 1"):
     with k1:
         st.markdown(f"<div class='kpi'><div class='small'>Jumlah responden</div><h3>{total_n}</h3></div>", unsafe_allow_html=True)
     with k2:
-        st.markdown(f"<div class='kpi'><div class='small'>Rata-rata uang saku</div><h3>{val_uang}</h3></div>", unsafe_allow_html=True)
+        st.markdown(f"<div class='kpi'><div class='small'>Rata-rata uang saku</div><h3>{val_uang}</h3>{ci_html('uang_saku')}</div>", unsafe_allow_html=True)
     with k3:
-        st.markdown(f"<div class='kpi'><div class='small'>Rata-rata pengeluaran FOMO</div><h3>{val_pengeluaran}</h3></div>", unsafe_allow_html=True)
+        st.markdown(f"<div class='kpi'><div class='small'>Rata-rata pengeluaran FOMO</div><h3>{val_pengeluaran}</h3>{ci_html('pengeluaran_fomo')}</div>", unsafe_allow_html=True)
     with k4:
         st.markdown(f"<div class='kpi'><div class='small'>Rata-rata kemampuan keuangan</div><h3>{val_kemampuan}</h3></div>", unsafe_allow_html=True)
     with k5:
-        st.markdown(f"<div class='kpi'><div class='small'>Rata-rata kesejahteraan psikologis</div><h3>{val_kesejahteraan}</h3></div>", unsafe_allow_html=True)
+        st.markdown(f"<div class='kpi'><div class='small'>Rata-rata kesejahteraan psikologis</div><h3>{val_kesejahteraan}</h3>{ci_html('kesejahteraan')}</div>", unsafe_allow_html=True)
 
     # ---------------------------
     # Narasi setelah KPI
@@ -303,8 +423,7 @@ if page.startswith("Halaman 1"):
     Kemampuan keuangan mahasiswa berada pada skor <b>{val_kemampuan}</b>, sedangkan 
     <b>kesejahteraan psikologis</b> mereka berada pada skor rata-rata <b>{val_kesejahteraan}</b>. 
     <br><br>
-    Hasil ini menunjukkan adanya kecenderungan bahwa semakin besar pengeluaran FOMO, semakin menurun kesejahteraan psikologis mahasiswa. 
-    Hal ini akan dibahas lebih detail pada visualisasi data di halaman berikutnya.
+    {interpretasi or ""} Hubungan ini dibahas lebih detail pada visualisasi data di halaman berikutnya.
     </div>
     """, unsafe_allow_html=True)
 
@@ -326,20 +445,44 @@ elif page.startswith("Halaman 2"):
         </p>
     </div>
     """, unsafe_allow_html=True)
-
-    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-        "Distribusi Responden",
-        "FOMO → Kesejahteraan",
-        "Kemampuan Keuangan → Kesejahteraan",
-        "FOMO ↔ Kemampuan Keuangan",
-        "Proporsi Pengeluaran FOMO",
-        "Korelasi Numerik"
-    ])
+    with tahap(rekaman, "insight"):
+        insight = teks_insight(DATA_VERSION, pilihan, ringkasan, indeks, mask_aktif, df_work)
+    with tahap(rekaman, "statistik"):
+        uji = statistik_uji(DATA_VERSION, pilihan, ringkasan, basis, mask_aktif)[0]
+
+    # Router bagian: hanya bagian yang dipilih yang dihitung & dikirim ke browser
+    # (st.tabs menjalankan keenam isi tab pada setiap rerun). Pilihan disimpan di
+    # query param ?bagian=... sehingga tautan ke analisis tertentu bisa dibagikan.
+    BAGIAN_H2 = {
+        "distribusi": "Distribusi Responden",
+        "fomo-kesejahteraan": "FOMO → Kesejahteraan",
+        "kemampuan-kesejahteraan": "Kemampuan Keuangan → Kesejahteraan",
+        "fomo-kemampuan": "FOMO ↔ Kemampuan Keuangan",
+        "proporsi": "Proporsi Pengeluaran FOMO",
+        "korelasi": "Korelasi Numerik",
+    }
+    slugs = list(BAGIAN_H2)
+    # Query param hanya dipakai sebagai nilai awal widget. Widget diberi key: jika index
+    # diturunkan dari URL di setiap rerun, identitas widget ikut berubah setelah pindah
+    # bagian dan klik berikutnya hilang.
+    if "bagian" not in st.session_state:
+        bagian_url = st.query_params.get("bagian", slugs[0])
+        st.session_state["bagian"] = bagian_url if bagian_url in BAGIAN_H2 else slugs[0]
+    bagian = st.radio(
+        "Pilih analisis",
+        slugs,
+        key="bagian",
+        format_func=BAGIAN_H2.get,
+        horizontal=True,
+        label_visibility="collapsed",
+    )
+    st.query_params["bagian"] = bagian
+    rekaman["bagian"] = bagian
 
     # =====================================================
     # TAB 1: Distribusi Responden
     # =====================================================
-    with tab1:
+    if bagian == "distribusi":
         # ---------------------------
         # Section: Distribusi fakultas & Pie FOMO (as in report)
         # ---------------------------
@@ -354,43 +497,10 @@ elif page.startswith("Halaman 2"):
             st.markdown("<div class='card'>", unsafe_allow_html=True)
             st.write("**Distribusi responden per fakultas**")
         
-            fac_counts = df_work["fakultas_clean"].value_counts().reset_index()
-            fac_counts.columns = ["Fakultas", "Jumlah"]
-        
-            fig_fac = px.bar(
-                fac_counts,
-                x="Fakultas",
-                y="Jumlah",
-                text="Jumlah",
-                color="Jumlah",
-                color_continuous_scale=[
-                    "#FDA19B", "#E47A7B", "#CB5D66", "#B14454", "#982E46", "#7F1D3A", "#660F2F"
-                ],
-                template="simple_white"
-            )
-            fig_fac.update_layout(
-                xaxis_title="",
-                yaxis_title="Jumlah responden",
-                font_family="Times New Roman",
-                title_font_color="#660F2F",
-                plot_bgcolor="rgba(0,0,0,0)",
-                paper_bgcolor="rgba(0,0,0,0)",
-            )
-            fig_fac.update_traces(
-                texttemplate='%{text}',
-                textposition='outside',
-                marker_line_color="#7F1D3A",
-                marker_line_width=1.2
-            )
-        
-            st.plotly_chart(fig_fac, use_container_width=True)
+            render_figure("fakultas_bar")
         
             # Insight dengan background
-            st.markdown("""
-            <div class="card" style="background:#FDA19B; color:#660F2F;">
-                💡 <b>Insight:</b> Responden terbanyak berasal dari Fakultas Ilmu Komputer, menunjukkan partisipasi survei yang paling tinggi.
-            </div>
-            """, unsafe_allow_html=True)
+            kartu_insight(insight["fakultas"], "#FDA19B")
             st.markdown("</div>", unsafe_allow_html=True)
         
             # ==========================================================
@@ -400,53 +510,11 @@ elif page.startswith("Halaman 2"):
                 st.markdown("<div class='card'>", unsafe_allow_html=True)
                 st.write("**Proporsi mahasiswa yang merasa FOMO**")
             
-                if 'col_fomo_text' in locals() and col_fomo_text and col_fomo_text in df_work.columns:
-                    pie_series = df_work[col_fomo_text].fillna("Tidak diisi").value_counts()
-                    fig_pie = px.pie(
-                        names=pie_series.index,
-                        values=pie_series.values,
-                        color_discrete_sequence=["#FDA19B", "#E47A7B", "#CB5D66", "#B14454", "#982E46", "#7F1D3A", "#660F2F"]
-                    )
-                    fig_pie.update_traces(
-                        textposition='inside',
-                        textinfo='percent+label',
-                        pull=0   # <-- diset 0 agar menyatu rapat
-                    )
-                else:
-                    if "fomo_num" in df_work.columns and df_work["fomo_num"].notna().sum() > 0:
-                        bins = [0, 1.5, 2.5, 3.5, 4.5, 5.5]
-                        labels = ["Tidak Pernah", "Jarang", "Kadang-kadang", "Sering", "Sangat Sering"]
-                        cat = pd.cut(df_work["fomo_num"].fillna(0), bins=bins, labels=labels)
-                        pie_series = cat.value_counts().reindex(labels).fillna(0)
-                        fig_pie = px.pie(
-                            names=pie_series.index,
-                            values=pie_series.values,
-                            color_discrete_sequence=["#FDA19B", "#E47A7B", "#CB5D66", "#B14454", "#982E46", "#7F1D3A", "#660F2F"]
-                        )
-                        fig_pie.update_traces(
-                            textposition='inside',
-                            textinfo='percent+label',
-                            pull=0   # <-- diset 0 agar menyatu rapat
-                        )
-                    else:
-                        st.info("Tidak ada data FOMO yang memadai untuk pie chart.")
-                        fig_pie = None
-            
-                if fig_pie:
-                    fig_pie.update_layout(
-                        font_family="Times New Roman",
-                        title_font_color="#660F2F",
-                        plot_bgcolor="rgba(0,0,0,0)",
-                        paper_bgcolor="rgba(0,0,0,0)"
-                    )
-                    st.plotly_chart(fig_pie, use_container_width=True)
-            
+                if render_figure("fomo_pie"):
                     # Insight dengan background
-                    st.markdown("""
-                    <div class="card" style="background:#E47A7B; color:#660F2F;">
-                        💡 <b>Insight:</b> Mayoritas mahasiswa tidak merasa FOMO (63,4%), sedangkan 36,6% mengaku merasa FOMO.
-                    </div>
-                    """, unsafe_allow_html=True)
+                    kartu_insight(insight["fomo"], "#E47A7B")
+                else:
+                    st.info("Tidak ada data FOMO yang memadai untuk pie chart.")
             
                 st.markdown("</div>", unsafe_allow_html=True)
 
@@ -454,90 +522,32 @@ elif page.startswith("Halaman 2"):
     # =====================================================
     # TAB 2: FOMO → Kesejahteraan
     # =====================================================
-    with tab2:
+    if bagian == "fomo-kesejahteraan":
         # ---------------------------
         # Section: FOMO -> Kesejahteraan (heatmap & distribusi bar, sampingan)
         # ---------------------------
         st.subheader("Pengaruh FOMO terhadap Kesejahteraan Psikologis")
-        PALET_WARNA = ['#FDA19B', '#E47A7B', '#CB5D66', '#B14454', '#982E46', '#7F1D3A', '#660F2F']
-        
-        if df_work["kesejahteraan_score"].notna().sum() > 0 and df_work["fomo_num"].notna().sum() > 0:
-            # Kategorisasi kesejahteraan
-            kbins = [-1, 2.5, 3.5, 5.5]
-            klabels = ["Buruk", "Cukup Baik", "Baik"]
-            df_work["kesejahteraan_cat"] = pd.cut(df_work["kesejahteraan_score"], bins=kbins, labels=klabels)
-        
-            # Kategorisasi FOMO
-            fbins = [0, 1.5, 2.5, 3.5, 4.5, 5.5]
-            flabels = ["Tidak Pernah", "Jarang", "Kadang-kadang", "Sering", "Sangat Sering"]
-            df_work["fomo_cat"] = pd.cut(df_work["fomo_num"].fillna(0), bins=fbins, labels=flabels)
-        
-            # Crosstab untuk heatmap
-            cross = pd.crosstab(df_work["fomo_cat"], df_work["kesejahteraan_cat"])
-            comb = df_work.groupby(["fomo_cat", "kesejahteraan_cat"]).size().reset_index(name="Jumlah")
         
+        if ada_data("kesejahteraan") and ada_data("fomo"):
             # Layout dua kolom
             col1, col2 = st.columns(2)
         
             # Heatmap
             with col1:
                 st.markdown("**Heatmap Hubungan FOMO dan Kesejahteraan Psikologis**")
-                fig_h = px.imshow(
-                    cross,
-                    text_auto=True,
-                    color_continuous_scale=PALET_WARNA,
-                    labels=dict(x="Kesejahteraan Psikologis", y="Tingkat FOMO", color="Jumlah Responden")
-                )
-                fig_h.update_layout(
-                    title="Heatmap Hubungan FOMO vs Kesejahteraan",
-                    font_family="Times New Roman",
-                    title_font_color='#660F2F',
-                    plot_bgcolor="rgba(0,0,0,0)",
-                    paper_bgcolor="rgba(0,0,0,0)"
-                )
-                st.plotly_chart(fig_h, use_container_width=True)
+                render_figure("fomo_kesejahteraan_heatmap")
         
                 # Insight khusus heatmap
-                st.markdown("""
-                <div class="card" style="background:#FDA19B; color:#660F2F;">
-                    💡 <b>Insight Heatmap:</b> Mayoritas mahasiswa tanpa FOMO berada pada kesejahteraan Baik (79 responden), sedangkan pada FOMO sangat sering jumlah Baik menurun (40 responden) dan Cukup Baik meningkat (13 responden).
-                </div>
-                """, unsafe_allow_html=True)
+                kartu_insight(insight["fomo_kesejahteraan_heatmap"], "#FDA19B", "Insight Heatmap")
+                kartu_insight(teks_uji(uji["fomo_kesejahteraan"]), "#FFF1F1", "Uji Statistik")
         
             # Distribusi bar (stacked)
             with col2:
                 st.markdown("**Distribusi Kesejahteraan Berdasarkan Tingkat FOMO**")
-                fig_comb = px.bar(
-                    comb,
-                    x="fomo_cat",
-                    y="Jumlah",
-                    color="kesejahteraan_cat",
-                    text="Jumlah",
-                    barmode="stack",
-                    labels={
-                        "fomo_cat": "Kategori FOMO",
-                        "Jumlah": "Jumlah Responden",
-                        "kesejahteraan_cat": "Kategori Kesejahteraan"
-                    },
-                    color_discrete_sequence=PALET_WARNA[:3]
-                )
-                fig_comb.update_traces(textposition="outside")
-                fig_comb.update_layout(
-                    title="Distribusi Kesejahteraan per Kategori FOMO",
-                    font_family="Times New Roman",
-                    title_font_color='#660F2F',
-                    legend_title_text="Kesejahteraan Psikologis",
-                    plot_bgcolor="rgba(0,0,0,0)",
-                    paper_bgcolor="rgba(0,0,0,0)"
-                )
-                st.plotly_chart(fig_comb, use_container_width=True)
+                render_figure("fomo_kesejahteraan_bar")
         
                 # Insight khusus bar chart
-                st.markdown("""
-                <div class="card" style="background:#E47A7B; color:#660F2F;">
-                    💡 <b>Insight Bar:</b> Semakin tinggi tingkat FOMO, proporsi mahasiswa dengan kesejahteraan Baik semakin menurun.
-                </div>
-                """, unsafe_allow_html=True)
+                kartu_insight(insight["fomo_kesejahteraan_bar"], "#E47A7B", "Insight Bar")
         
         else:
             st.info("Data FOMO numerik dan/atau skor kesejahteraan tidak memadai untuk analisis ini.")
@@ -546,29 +556,11 @@ elif page.startswith("Halaman 2"):
     # =====================================================
     # TAB 3: Kemampuan Keuangan → Kesejahteraan
     # =====================================================
-    with tab3:
+    if bagian == "kemampuan-kesejahteraan":
         st.subheader("Pengaruh Kemampuan Mengelola Keuangan terhadap Kesejahteraan Psikologis")
-        PALET_WARNA = ['#FDA19B', '#E47A7B', '#CB5D66', '#B14454', '#982E46', '#7F1D3A', '#660F2F']
         
         if "kemampuan_num" in df_work.columns and "kesejahteraan_score" in df_work.columns:
-            if df_work["kemampuan_num"].notna().sum() > 0 and df_work["kesejahteraan_score"].notna().sum() > 0:
-                # Buat kategori kemampuan dan kesejahteraan
-                df_work["kemampuan_cat"] = pd.cut(
-                    df_work["kemampuan_num"], 
-                    bins=[0, 1.5, 2.5, 3.5, 4.5, 5.5],
-                    labels=["Buruk", "Kurang Baik", "Cukup Baik", "Baik", "Sangat Baik"]
-                )
-        
-                df_work["kesejahteraan_cat"] = pd.cut(
-                    df_work["kesejahteraan_score"], 
-                    bins=[0, 2.5, 3.5, 5.5],
-                    labels=["Buruk", "Cukup Baik", "Baik"]
-                )
-        
-                # Data untuk heatmap dan bar chart
-                heat_data = pd.crosstab(df_work["kemampuan_cat"], df_work["kesejahteraan_cat"])
-                bar_data = df_work.groupby(["kemampuan_cat", "kesejahteraan_cat"]).size().reset_index(name="Jumlah")
-        
+            if ada_data("kemampuan") and ada_data("kesejahteraan"):
                 # ==========================================================
                 # Layout dua kolom
                 # ==========================================================
@@ -576,61 +568,18 @@ elif page.startswith("Halaman 2"):
         
                 with col1:
                     st.markdown("**Heatmap Hubungan Kemampuan Keuangan dan Kesejahteraan**")
-                    fig_heat = px.imshow(
-                        heat_data,
-                        text_auto=True,
-                        color_continuous_scale=PALET_WARNA,
-                        labels=dict(x="Kesejahteraan Psikologis", y="Kemampuan Mengelola Keuangan", color="Jumlah Responden")
-                    )
-                    fig_heat.update_layout(
-                        title="Heatmap Hubungan Kemampuan Keuangan vs Kesejahteraan",
-                        font_family="Times New Roman",
-                        title_font_color='#660F2F',
-                        plot_bgcolor="rgba(0,0,0,0)",
-                        paper_bgcolor="rgba(0,0,0,0)"
-                    )
-                    st.plotly_chart(fig_heat, use_container_width=True)
+                    render_figure("kemampuan_kesejahteraan_heatmap")
         
                     # Insight khusus heatmap
-                    st.markdown("""
-                    <div class="card" style="background:#FDA19B; color:#660F2F;">
-                        💡 <b>Insight Heatmap:</b> Pola warna menunjukkan semakin tinggi kemampuan mengelola keuangan, semakin banyak mahasiswa dengan kesejahteraan baik.
-                    </div>
-                    """, unsafe_allow_html=True)
+                    kartu_insight(insight["kemampuan_kesejahteraan_heatmap"], "#FDA19B", "Insight Heatmap")
+                    kartu_insight(teks_uji(uji["kemampuan_kesejahteraan"]), "#FFF1F1", "Uji Statistik")
         
                 with col2:
                     st.markdown("**Distribusi Kesejahteraan Berdasarkan Kemampuan Mengelola Keuangan**")
-                    fig_bar = px.bar(
-                        bar_data,
-                        x="kemampuan_cat",
-                        y="Jumlah",
-                        color="kesejahteraan_cat",
-                        text="Jumlah",
-                        barmode="stack",
-                        labels={
-                            "kemampuan_cat": "Kemampuan Mengelola Keuangan",
-                            "Jumlah": "Jumlah Responden",
-                            "kesejahteraan_cat": "Kategori Kesejahteraan"
-                        },
-                        color_discrete_sequence=PALET_WARNA[:3]
-                    )
-                    fig_bar.update_traces(textposition='outside')
-                    fig_bar.update_layout(
-                        title="Distribusi Kesejahteraan per Kategori Kemampuan Keuangan",
-                        font_family="Times New Roman",
-                        title_font_color='#660F2F',
-                        legend_title_text="Kesejahteraan Psikologis",
-                        plot_bgcolor="rgba(0,0,0,0)",
-                        paper_bgcolor="rgba(0,0,0,0)"
-                    )
-                    st.plotly_chart(fig_bar, use_container_width=True)
+                    render_figure("kemampuan_kesejahteraan_bar")
         
                     # Insight khusus bar chart
-                    st.markdown("""
-                    <div class="card" style="background:#E47A7B; color:#660F2F;">
-                        💡 <b>Insight Bar:</b> Mahasiswa dengan kemampuan keuangan kategori "Baik" dan "Sangat Baik" lebih dominan berada pada kesejahteraan yang tinggi.
-                    </div>
-                    """, unsafe_allow_html=True)
+                    kartu_insight(insight["kemampuan_kesejahteraan_bar"], "#E47A7B", "Insight Bar")
             else:
                 st.info("Data kemampuan keuangan atau kesejahteraan tidak memadai untuk analisis ini.")
         else:
@@ -640,33 +589,14 @@ elif page.startswith("Halaman 2"):
     # =====================================================
     # TAB 4: FOMO ↔ Kemampuan Keuangan
     # =====================================================
-    with tab4:
+    if bagian == "fomo-kemampuan":
         # ---------------------------
         # Section: Hubungan antara FOMO dan Kemampuan Mengelola Keuangan
         # ---------------------------
         st.subheader("Hubungan antara FOMO dan Kemampuan Mengelola Keuangan")
         
-        PALET_WARNA = ['#FDA19B', '#E47A7B', '#CB5D66', '#B14454', '#982E46', '#7F1D3A', '#660F2F']
-        
         if "fomo_num" in df_work.columns and "kemampuan_num" in df_work.columns:
-            if df_work["fomo_num"].notna().sum() > 0 and df_work["kemampuan_num"].notna().sum() > 0:
-                # Buat kategori FOMO dan Kemampuan Keuangan
-                df_work["fomo_cat"] = pd.cut(
-                    df_work["fomo_num"],
-                    bins=[0, 1.5, 2.5, 3.5, 4.5, 5.5],
-                    labels=["Tidak Pernah", "Jarang", "Kadang-kadang", "Sering", "Sangat Sering"]
-                )
-        
-                df_work["kemampuan_cat"] = pd.cut(
-                    df_work["kemampuan_num"],
-                    bins=[0, 1.5, 2.5, 3.5, 4.5, 5.5],
-                    labels=["Buruk", "Kurang Baik", "Cukup Baik", "Baik", "Sangat Baik"]
-                )
-        
-                # Data untuk heatmap dan stacked bar
-                heat_data = pd.crosstab(df_work["fomo_cat"], df_work["kemampuan_cat"])
-                bar_data = df_work.groupby(["fomo_cat", "kemampuan_cat"]).size().reset_index(name="Jumlah")
-        
+            if ada_data("fomo") and ada_data("kemampuan"):
                 # Layout dua kolom (sampingan)
                 col1, col2 = st.columns(2)
         
@@ -675,67 +605,21 @@ elif page.startswith("Halaman 2"):
                 # ---------------------------
                 with col1:
                     st.markdown("**Heatmap Hubungan FOMO vs Kemampuan Mengelola Keuangan**")
-                    fig_heat = px.imshow(
-                        heat_data,
-                        text_auto=True,
-                        color_continuous_scale=PALET_WARNA,
-                        labels=dict(x="Kemampuan Mengelola Keuangan", y="Tingkat FOMO", color="Jumlah Responden")
-                    )
-                    fig_heat.update_layout(
-                        title="Heatmap Hubungan FOMO vs Kemampuan Mengelola Keuangan",
-                        font_family="Times New Roman",
-                        title_font_color="#660F2F",
-                        plot_bgcolor="rgba(0,0,0,0)",
-                        paper_bgcolor="rgba(0,0,0,0)"
-                    )
-                    st.plotly_chart(fig_heat, use_container_width=True)
+                    render_figure("fomo_kemampuan_heatmap")
         
                     # Insight heatmap
-                    st.markdown("""
-                    <div class="card" style="background:#FDA19B; color:#660F2F;">
-                        💡 <b>Insight Heatmap:</b> Pola warna memperlihatkan bahwa semakin tinggi tingkat FOMO, 
-                        semakin sedikit mahasiswa dengan kemampuan keuangan baik.
-                    </div>
-                    """, unsafe_allow_html=True)
+                    kartu_insight(insight["fomo_kemampuan_heatmap"], "#FDA19B", "Insight Heatmap")
+                    kartu_insight(teks_uji(uji["fomo_kemampuan"]), "#FFF1F1", "Uji Statistik")
         
                 # ---------------------------
                 # STACKED BAR
                 # ---------------------------
                 with col2:
                     st.markdown("**Distribusi Kemampuan Mengelola Keuangan Berdasarkan Tingkat FOMO**")
-                    fig_bar = px.bar(
-                        bar_data,
-                        x="fomo_cat",
-                        y="Jumlah",
-                        color="kemampuan_cat",
-                        text="Jumlah",
-                        barmode="stack",
-                        labels={
-                            "fomo_cat": "Tingkat FOMO",
-                            "Jumlah": "Jumlah Responden",
-                            "kemampuan_cat": "Kemampuan Mengelola Keuangan"
-                        },
-                        color_discrete_sequence=PALET_WARNA[:5]
-                    )
-                    fig_bar.update_traces(textposition="outside")
-                    fig_bar.update_layout(
-                        title="Distribusi Kemampuan Keuangan Berdasarkan Tingkat FOMO",
-                        font_family="Times New Roman",
-                        
-                        title_font_color="#660F2F",
-                        legend_title_text="Kemampuan Keuangan",
-                        plot_bgcolor="rgba(0,0,0,0)",
-                        paper_bgcolor="rgba(0,0,0,0)"
-                    )
-                    st.plotly_chart(fig_bar, use_container_width=True)
+                    render_figure("fomo_kemampuan_bar")
         
                     # Insight bar chart
-                    st.markdown("""
-                    <div class="card" style="background:#E47A7B; color:#660F2F;">
-                        💡 <b>Insight Bar:</b> Mahasiswa dengan FOMO rendah lebih banyak memiliki kemampuan keuangan 
-                        kategori "Baik" hingga "Sangat Baik", sedangkan FOMO tinggi didominasi kategori "Buruk".
-                    </div>
-                    """, unsafe_allow_html=True)
+                    kartu_insight(insight["fomo_kemampuan_bar"], "#E47A7B", "Insight Bar")
         
             else:
                 st.info("Data FOMO atau kemampuan keuangan tidak memadai untuk analisis ini.")
@@ -745,13 +629,13 @@ elif page.startswith("Halaman 2"):
     # =====================================================
     # TAB 5: Proporsi Pengeluaran FOMO dari Uang Saku
     # =====================================================
-    with tab5:
+    if bagian == "proporsi":
         # ---------------------------
         # Section: Proporsi Pengeluaran FOMO terhadap Uang Saku (%)
         # ---------------------------
         st.subheader("Proporsi Pengeluaran FOMO terhadap Uang Saku (%)")
         
-        if df_work["proporsi_fomo_pct"].notna().sum() > 0:
+        if not pd.isna(rata_rata(ringkasan, "proporsi_fomo_pct")):
             # Layout dua kolom (sampingan, bukan atas–bawah)
             c1, c2 = st.columns(2)
         
@@ -761,42 +645,10 @@ elif page.startswith("Halaman 2"):
             with c1:
                 st.markdown("<div class='card'>", unsafe_allow_html=True)
                 st.markdown("**Proporsi Pengeluaran FOMO dari Uang Saku**")
-            
-                bins = [0, 20, 50, 100]
-                labels = ["Rendah (<20%)", "Sedang (20–50%)", "Tinggi (>50%)"]
-                df_work["kategori_proporsi"] = pd.cut(df_work["proporsi_fomo_pct"], bins=bins, labels=labels, include_lowest=True)
-                proporsi_counts = df_work["kategori_proporsi"].value_counts().reindex(labels)
-            
-                fig_pie = px.pie(
-                    values=proporsi_counts.values,
-                    names=proporsi_counts.index,
-                    color=proporsi_counts.index,
-                    color_discrete_sequence=['#FDD6D8', '#F98980', '#B14454']
-                )
-                fig_pie.update_traces(
-                    textinfo="label+percent",
-                    textposition="inside",
-                    pull=0,  # <-- diset 0 agar menyatu rapat
-                    marker=dict(line=dict(color='rgba(0,0,0,0)', width=0))  # <-- hilangkan garis putih
-                )
-                fig_pie.update_layout(
-                    title="Proporsi Pengeluaran FOMO dari Uang Saku",
-                    font_family="Times New Roman",
-                    title_font_color="#660F2F",
-                    legend=dict(title="", orientation="v", yanchor="middle", y=0.5, xanchor="left", x=1.05),
-                    margin=dict(l=10, r=10, t=40, b=10),
-                    plot_bgcolor="rgba(0,0,0,0)",
-                    paper_bgcolor="rgba(0,0,0,0)"
-                )
-                st.plotly_chart(fig_pie, use_container_width=True)
+                render_figure("proporsi_pie")
             
                 # Insight card
-                st.markdown("""
-                <div class="card" style="background:#FDA19B; color:#660F2F;">
-                    💡 <b>Insight:</b> Sebagian besar responden berada pada kategori sedang (20–50%), 
-                    menandakan proporsi pengeluaran FOMO yang moderat terhadap uang saku.
-                </div>
-                """, unsafe_allow_html=True)
+                kartu_insight(insight["proporsi_pie"], "#FDA19B")
                 st.markdown("</div>", unsafe_allow_html=True)
 
         
@@ -807,43 +659,10 @@ elif page.startswith("Halaman 2"):
                 st.markdown("<div class='card'>", unsafe_allow_html=True)
                 st.markdown("**Distribusi Proporsi Pengeluaran FOMO dari Uang Saku**")
         
-                mean_proporsi = df_work["proporsi_fomo_pct"].mean()
-        
-                fig_hist = go.Figure()
-                fig_hist.add_trace(go.Histogram(
-                    x=df_work["proporsi_fomo_pct"],
-                    nbinsx=20,
-                    marker_color="#E47A7B",
-                    opacity=0.8
-                ))
-                fig_hist.add_vline(
-                    x=mean_proporsi,
-                    line_dash="dash",
-                    line_color="#B14454",
-                    annotation_text=f"Rata-rata: {mean_proporsi:.1f}%",
-                    annotation_position="top right",
-                    annotation_font_size=12,
-                    annotation_font_color="#660F2F"
-                )
-                fig_hist.update_layout(
-                    title="Distribusi Proporsi Pengeluaran FOMO dari Uang Saku",
-                    xaxis_title="Proporsi Pengeluaran FOMO (%)",
-                    yaxis_title="Jumlah Responden",
-                    font_family="Times New Roman",
-                    title_font_color="#660F2F",
-                    plot_bgcolor="rgba(0,0,0,0)",
-                    paper_bgcolor="rgba(0,0,0,0)",
-                    margin=dict(l=10, r=10, t=40, b=10)
-                )
-                st.plotly_chart(fig_hist, use_container_width=True)
+                render_figure("proporsi_hist")
         
                 # Insight card
-                st.markdown(f"""
-                <div class="card" style="background:#E47A7B; color:#660F2F;">
-                    💡 <b>Insight:</b> Sebagian besar responden memiliki proporsi FOMO di bawah 50%, 
-                    dengan rata-rata sekitar {mean_proporsi:.1f}%.
-                </div>
-                """, unsafe_allow_html=True)
+                kartu_insight(insight["proporsi_hist"], "#E47A7B")
                 st.markdown("</div>", unsafe_allow_html=True)
         else:
             st.info("Data pengeluaran FOMO dan/atau uang saku tidak memadai untuk analisis proporsi.")
@@ -852,70 +671,18 @@ elif page.startswith("Halaman 2"):
     # =====================================================
     # TAB 6: Korelasi Numerik
     # =====================================================
-    with tab6:
-        st.subheader("Korelasi Antar Variabel Numerik (Pearson)")
-        
-        num_df = df_work.select_dtypes(include=[np.number]).copy()
-        num_df = num_df.loc[:, num_df.notna().any()]  # drop all-empty cols
-        
-        if num_df.shape[1] > 1:
-            corr = num_df.corr().round(2)
-        
-            # Membuat annotated heatmap manual dengan plotly.graph_objects
-            fig_corr = go.Figure()
-        
-            fig_corr.add_trace(go.Heatmap(
-                z=corr.values,
-                x=corr.columns,
-                y=corr.columns,
-                colorscale=[
-                    [0.0, '#FDA19B'],
-                    [0.2, '#E47A7B'],
-                    [0.4, '#CB5D66'],
-                    [0.6, '#B14454'],
-                    [0.8, '#982E46'],
-                    [1.0, '#660F2F']
-                ],
-                zmin=-1,
-                zmax=1,
-                hovertemplate="Variabel X=%{x}<br>Variabel Y=%{y}<br>Korelasi=%{z}<extra></extra>"
-            ))
-        
-            # Tambahkan anotasi nilai korelasi di setiap sel
-            annotations = []
-            for i, row in enumerate(corr.values):
-                for j, val in enumerate(row):
-                    annotations.append(
-                        dict(
-                            x=corr.columns[j],
-                            y=corr.index[i],
-                            text=str(val),
-                            showarrow=False,
-                            font=dict(color="white" if abs(val) > 0.5 else "#330A1C", size=12)
-                        )
-                    )
-        
-            fig_corr.update_layout(
-                title="Heatmap Korelasi (Pearson) dengan Nilai Korelasi",
-                font_family="Times New Roman",
-                title_font_color='#660F2F',
-                height=700,
-                annotations=annotations,
-                xaxis=dict(side="bottom"),
-                plot_bgcolor="rgba(0,0,0,0)",
-                paper_bgcolor="rgba(0,0,0,0)"
-            )
-        
-            st.plotly_chart(fig_corr, use_container_width=True)
-        
+    if bagian == "korelasi":
+        metode = st.radio(
+            "Metode korelasi",
+            list(METODE_KORELASI),
+            format_func=METODE_KORELASI.get,
+            horizontal=True,
+        )
+        st.subheader(f"Korelasi Antar Variabel Numerik ({METODE_KORELASI[metode]})")
+        
+        if render_figure("korelasi_heatmap", metode=metode):
             # Insight dengan background (seragam seperti bagian lain)
-            st.markdown("""
-            <div class="card" style="background:#FDA19B; color:#660F2F;">
-                💡 <b>Insight:</b> Korelasi positif terlihat kuat pada variabel-variabel keuangan, 
-                sedangkan korelasi negatif muncul antara FOMO dengan kesejahteraan. 
-                Nilai di atas 0,7 menandakan hubungan yang sangat kuat.
-            </div>
-            """, unsafe_allow_html=True)
+            kartu_insight(insight["korelasi"].get(metode), "#FDA19B")
         
         else:
             st.info("Tidak cukup variabel numerik untuk menampilkan korelasi.")
@@ -973,48 +740,15 @@ elif page.startswith("Halaman 3"):
     # ================================
     # Isi Kesimpulan
     # ================================
-    st.markdown("""
+    # Setiap kartu diturunkan dari agregat data terbaru (lihat insight.py)
+    with tahap(rekaman, "insight"):
+        insight = teks_insight(DATA_VERSION, pilihan, ringkasan, indeks, mask_aktif, df_work)
+    st.markdown("".join(f"""
     <div class="kesimpulan-card">
-        <h3>Partisipasi Responden</h3>
-        <p>Mayoritas responden berasal dari <b>Fakultas Ilmu Komputer</b>, menunjukkan partisipasi survei yang paling tinggi.</p>
+        <h3>{judul}</h3>
+        <p>{isi}</p>
     </div>
-
-    <div class="kesimpulan-card">
-        <h3>Fenomena FOMO</h3>
-        <p>Sebanyak <b>63,4%</b> mahasiswa tidak merasa FOMO, sementara <b>36,6%</b> mengaku mengalami FOMO.</p>
-    </div>
-
-    <div class="kesimpulan-card">
-        <h3>FOMO & Kesejahteraan Psikologis</h3>
-        <p>Mahasiswa yang jarang FOMO cenderung memiliki <b>kesejahteraan psikologis yang Baik</b> (79 responden). 
-        Namun, pada kategori <b>FOMO sangat sering</b>, jumlah mahasiswa dengan kesejahteraan Baik menurun (40 responden) 
-        dan meningkat pada kategori Cukup Baik (13 responden).</p>
-    </div>
-
-    <div class="kesimpulan-card">
-        <h3>Kemampuan Keuangan & Kesejahteraan</h3>
-        <p>Mahasiswa dengan kemampuan mengelola keuangan <b>Baik hingga Sangat Baik</b> lebih dominan berada pada 
-        kesejahteraan yang tinggi. Sebaliknya, kemampuan keuangan rendah banyak dikaitkan dengan kesejahteraan Buruk.</p>
-    </div>
-
-    <div class="kesimpulan-card">
-        <h3>FOMO vs Kemampuan Keuangan</h3>
-        <p>Tingkat FOMO yang tinggi berkorelasi dengan <b>penurunan kemampuan keuangan</b>. 
-        Mahasiswa dengan FOMO rendah didominasi kategori “Baik–Sangat Baik”, sedangkan FOMO tinggi banyak berada di kategori “Buruk”.</p>
-    </div>
-
-    <div class="kesimpulan-card">
-        <h3>Proporsi Pengeluaran FOMO</h3>
-        <p>Mayoritas responden memiliki proporsi pengeluaran FOMO <b>sedang (20–50%)</b> terhadap uang saku, 
-        dengan rata-rata sekitar <b>34,1%</b>.</p>
-    </div>
-
-    <div class="kesimpulan-card">
-        <h3>Korelasi Antar Variabel</h3>
-        <p>Korelasi positif yang kuat ditemukan pada variabel-variabel keuangan, sedangkan korelasi negatif terlihat 
-        antara <b>tingkat FOMO dengan kesejahteraan psikologis</b>, menandakan semakin tinggi FOMO maka kesejahteraan cenderung menurun.</p>
-    </div>
-    """, unsafe_allow_html=True)
+    """ for judul, isi in insight["kesimpulan"]), unsafe_allow_html=True)
 
     # Footer
     st.markdown(f"""
@@ -1023,4 +757,39 @@ elif page.startswith("Halaman 3"):
     </div>
     """, unsafe_allow_html=True)
 
+# ================================
+# Halaman 4: Tren Waktu
+# ================================
+elif page.startswith("Halaman 4"):
+    st.markdown(f"""
+    <div style="background:{PRIMARY}; padding:22px; border-radius:10px; text-align:center;">
+      <h1 style="margin:6px; color:white;">Tren Waktu Pengisian</h1>
+    </div>
+    """, unsafe_allow_html=True)
 
+    st.write("")
+    # Rentang waktu & filter lain diatur di sidebar; ember harian hanya dihitung ulang bila
+    # filter selain waktu berubah
+    jendela = st.radio("Jendela rata-rata bergulir", JENDELA_TREN, index=1,
+                       format_func=lambda h: f"{h} hari", horizontal=True)
+    tabel = tren_aktif(jendela)
+    if tabel is None:
+        st.info("Data waktu pengisian tidak tersedia untuk filter ini.")
+    else:
+        puncak = tabel["respons"].idxmax()
+        k1, k2, k3 = st.columns(3)
+        k1.markdown(f"<div class='kpi'><div class='small'>Rentang Hari</div><h3>{len(tabel)}</h3></div>", unsafe_allow_html=True)
+        k2.markdown(f"<div class='kpi'><div class='small'>Rata-rata Respons/Hari</div><h3>{tabel['respons'].mean():.1f}</h3></div>", unsafe_allow_html=True)
+        k3.markdown(f"<div class='kpi'><div class='small'>Hari Tersibuk</div><h3>{puncak:%d %b %Y}</h3></div>", unsafe_allow_html=True)
+
+        st.write("")
+        render_figure("tren_respons", jendela=jendela)
+        if not render_figure("tren_ukuran", jendela=jendela):
+            st.info("Data FOMO/kesejahteraan/proporsi tidak memadai untuk tren rata-rata.")
+        st.caption("Rata-rata bergulir dihitung dari seluruh respons dalam jendela "
+                   "(bobot per responden), bukan rata-rata dari rata-rata harian.")
+
+# ================================
+# Instrumentasi
+# ================================
+catat_rerun(df_work)
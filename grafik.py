@@ -0,0 +1,369 @@
+# grafik.py
+# Builder grafik Plotly (tanpa Streamlit), dipakai dashboard & ekspor laporan
+#
+# Setiap builder menerima satu `tampilan`, yaitu dict berisi:
+#   df_work   : frame kerja (baris per responden), dipakai bersama semua sesi: hanya dibaca
+#   mask      : boolean per baris untuk subset (None = semua baris)
+#   ringkasan : kubus OLAP subset tersebut (lihat agregasi.py)
+#   fomo_text : nama kolom jawaban teks FOMO (atau None)
+#   korelasi  : fungsi tanpa argumen yang mengembalikan matriks korelasi subset
+#   tren      : fungsi (jendela) → tabel tren harian subset (lihat tren.py), atau None
+# plotly diimpor di dalam builder, jadi halaman tanpa grafik tidak memuatnya. Cache hit
+# tetap memuat plotly.io karena st.plotly_chart mengimpornya saat merender.
+#
+# Ukuran payload: builder tidak pernah meneruskan array per baris ke trace Plotly.
+# Data per baris selalu diagregasi di server lebih dulu (kubus, value_counts, histogram
+# di agregasi.py), sehingga JSON yang dikirim ke browser berukuran O(bin/kategori),
+# bukan O(responden), berapa pun jumlah barisnya.
+
+import numpy as np
+
+from analitik.agregasi import contingency, frekuensi, histogram, long_form, rata_rata
+from analitik.tren import UKURAN_TREN
+
+PALET_WARNA = ["#FDA19B", "#E47A7B", "#CB5D66", "#B14454", "#982E46", "#7F1D3A", "#660F2F"]
+
+
+def _layout_dasar(fig, **kwargs):
+    # kwargs (title, dll.) diterapkan dulu agar title_font_color tidak tertimpa
+    fig.update_layout(**kwargs)
+    fig.update_layout(
+        font_family="Times New Roman",
+        title_font_color="#660F2F",
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)"
+    )
+    return fig
+
+
+def _saring(tampilan, kolom):
+    # Kolom yang dibutuhkan builder, dibatasi ke baris yang lolos filter
+    s = tampilan["df_work"][kolom]
+    return s if tampilan["mask"] is None else s[tampilan["mask"]]
+
+
+def fig_fakultas_bar(tampilan):
+    import plotly.express as px
+    # Diambil dari kubus (sumbu fakultas), terbanyak dulu seperti value_counts
+    fac_counts = frekuensi(tampilan["ringkasan"], "fakultas")
+    fac_counts = fac_counts[fac_counts > 0].sort_values(ascending=False, kind="stable").reset_index()
+    fac_counts.columns = ["Fakultas", "Jumlah"]
+
+    fig_fac = px.bar(
+        fac_counts,
+        x="Fakultas",
+        y="Jumlah",
+        text="Jumlah",
+        color="Jumlah",
+        color_continuous_scale=PALET_WARNA,
+        template="simple_white"
+    )
+    _layout_dasar(fig_fac, xaxis_title="", yaxis_title="Jumlah responden")
+    fig_fac.update_traces(
+        texttemplate='%{text}',
+        textposition='outside',
+        marker_line_color="#7F1D3A",
+        marker_line_width=1.2
+    )
+    return fig_fac
+
+
+def fig_fomo_pie(tampilan):
+    import plotly.express as px
+    df_work, col_fomo_text = tampilan["df_work"], tampilan["fomo_text"]
+    if col_fomo_text and col_fomo_text in df_work.columns:
+        pie_series = _saring(tampilan, col_fomo_text).astype(object).fillna("Tidak diisi").value_counts()
+    elif "fomo_num" in df_work.columns and df_work["fomo_num"].notna().sum() > 0:
+        pie_series = frekuensi(tampilan["ringkasan"], "fomo")
+    else:
+        return None
+
+    fig_pie = px.pie(
+        names=pie_series.index,
+        values=pie_series.values,
+        color_discrete_sequence=PALET_WARNA
+    )
+    fig_pie.update_traces(
+        textposition='inside',
+        textinfo='percent+label',
+        pull=0   # <-- diset 0 agar menyatu rapat
+    )
+    return _layout_dasar(fig_pie)
+
+
+def _fig_heatmap(cross, title, x_label, y_label):
+    import plotly.express as px
+    if cross.empty:
+        return None
+    fig = px.imshow(
+        cross,
+        text_auto=True,
+        color_continuous_scale=PALET_WARNA,
+        labels=dict(x=x_label, y=y_label, color="Jumlah Responden")
+    )
+    return _layout_dasar(fig, title=title)
+
+
+def _fig_stacked_bar(comb, x, color, labels, title, legend_title, n_warna):
+    import plotly.express as px
+    if comb.empty:
+        return None
+    fig = px.bar(
+        comb,
+        x=x,
+        y="Jumlah",
+        color=color,
+        text="Jumlah",
+        barmode="stack",
+        labels=labels,
+        color_discrete_sequence=PALET_WARNA[:n_warna]
+    )
+    fig.update_traces(textposition="outside")
+    return _layout_dasar(fig, title=title, legend_title_text=legend_title)
+
+
+def _kontingensi(tampilan, a, b):
+    # Irisan kubus ringkasan (dihitung sekali per versi data / diperbarui saat append;
+    # saat filter aktif, ringkasan adalah kubus subset)
+    return contingency(tampilan["ringkasan"], a, b)
+
+
+def fig_fomo_kesejahteraan_heatmap(tampilan):
+    cross = _kontingensi(tampilan, "fomo", "kesejahteraan")
+    return _fig_heatmap(cross, "Heatmap Hubungan FOMO vs Kesejahteraan",
+                        "Kesejahteraan Psikologis", "Tingkat FOMO")
+
+
+def fig_fomo_kesejahteraan_bar(tampilan):
+    comb = long_form(_kontingensi(tampilan, "fomo", "kesejahteraan"))
+    return _fig_stacked_bar(
+        comb, "fomo_cat", "kesejahteraan_cat",
+        {"fomo_cat": "Kategori FOMO", "Jumlah": "Jumlah Responden", "kesejahteraan_cat": "Kategori Kesejahteraan"},
+        "Distribusi Kesejahteraan per Kategori FOMO", "Kesejahteraan Psikologis", 3
+    )
+
+
+def fig_kemampuan_kesejahteraan_heatmap(tampilan):
+    heat_data = _kontingensi(tampilan, "kemampuan", "kesejahteraan")
+    return _fig_heatmap(heat_data, "Heatmap Hubungan Kemampuan Keuangan vs Kesejahteraan",
+                        "Kesejahteraan Psikologis", "Kemampuan Mengelola Keuangan")
+
+
+def fig_kemampuan_kesejahteraan_bar(tampilan):
+    bar_data = long_form(_kontingensi(tampilan, "kemampuan", "kesejahteraan"))
+    return _fig_stacked_bar(
+        bar_data, "kemampuan_cat", "kesejahteraan_cat",
+        {"kemampuan_cat": "Kemampuan Mengelola Keuangan", "Jumlah": "Jumlah Responden", "kesejahteraan_cat": "Kategori Kesejahteraan"},
+        "Distribusi Kesejahteraan per Kategori Kemampuan Keuangan", "Kesejahteraan Psikologis", 3
+    )
+
+
+def fig_fomo_kemampuan_heatmap(tampilan):
+    heat_data = _kontingensi(tampilan, "fomo", "kemampuan")
+    return _fig_heatmap(heat_data, "Heatmap Hubungan FOMO vs Kemampuan Mengelola Keuangan",
+                        "Kemampuan Mengelola Keuangan", "Tingkat FOMO")
+
+
+def fig_fomo_kemampuan_bar(tampilan):
+    bar_data = long_form(_kontingensi(tampilan, "fomo", "kemampuan"))
+    return _fig_stacked_bar(
+        bar_data, "fomo_cat", "kemampuan_cat",
+        {"fomo_cat": "Tingkat FOMO", "Jumlah": "Jumlah Responden", "kemampuan_cat": "Kemampuan Mengelola Keuangan"},
+        "Distribusi Kemampuan Keuangan Berdasarkan Tingkat FOMO", "Kemampuan Keuangan", 5
+    )
+
+
+def fig_proporsi_pie(tampilan):
+    import plotly.express as px
+    proporsi_counts = frekuensi(tampilan["ringkasan"], "proporsi")
+
+    fig_pie = px.pie(
+        values=proporsi_counts.values,
+        names=proporsi_counts.index,
+        color=proporsi_counts.index,
+        color_discrete_sequence=['#FDD6D8', '#F98980', '#B14454']
+    )
+    fig_pie.update_traces(
+        textinfo="label+percent",
+        textposition="inside",
+        pull=0,  # <-- diset 0 agar menyatu rapat
+        marker=dict(line=dict(color='rgba(0,0,0,0)', width=0))  # <-- hilangkan garis putih
+    )
+    return _layout_dasar(
+        fig_pie,
+        title="Proporsi Pengeluaran FOMO dari Uang Saku",
+        legend=dict(title="", orientation="v", yanchor="middle", y=0.5, xanchor="left", x=1.05),
+        margin=dict(l=10, r=10, t=40, b=10)
+    )
+
+
+def fig_proporsi_hist(tampilan):
+    import plotly.graph_objects as go
+    # Di-bin di server (np.bincount ke ~20 bin rapi) lalu dikirim sebagai bar,
+    # bukan go.Histogram yang meminta browser mem-bin seluruh baris
+    hasil = histogram(_saring(tampilan, "proporsi_fomo_pct"), nbins=20)
+    if hasil is None:
+        return None
+    jumlah, tepi = hasil
+    mean_proporsi = rata_rata(tampilan["ringkasan"], "proporsi_fomo_pct")
+
+    fig_hist = go.Figure()
+    fig_hist.add_trace(go.Bar(
+        x=(tepi[:-1] + tepi[1:]) / 2,
+        y=jumlah,
+        width=tepi[1] - tepi[0],
+        customdata=np.column_stack([tepi[:-1], tepi[1:]]),
+        hovertemplate="%{customdata[0]:.4g}–%{customdata[1]:.4g}%<br>Jumlah=%{y}<extra></extra>",
+        marker_color="#E47A7B",
+        opacity=0.8
+    ))
+    fig_hist.add_vline(
+        x=mean_proporsi,
+        line_dash="dash",
+        line_color="#B14454",
+        annotation_text=f"Rata-rata: {mean_proporsi:.1f}%",
+        annotation_position="top right",
+        annotation_font_size=12,
+        annotation_font_color="#660F2F"
+    )
+    return _layout_dasar(
+        fig_hist,
+        title="Distribusi Proporsi Pengeluaran FOMO dari Uang Saku",
+        xaxis_title="Proporsi Pengeluaran FOMO (%)",
+        yaxis_title="Jumlah Responden",
+        bargap=0,
+        margin=dict(l=10, r=10, t=40, b=10)
+    )
+
+
+METODE_KORELASI = {"pearson": "Pearson", "spearman": "Spearman"}
+
+
+def fig_korelasi_heatmap(tampilan, metode="pearson"):
+    import plotly.graph_objects as go
+    corr = tampilan["korelasi"]()[metode]
+    if corr.shape[1] <= 1:
+        return None
+    corr = corr.round(2)
+
+    # Nilai korelasi ditulis lewat texttemplate heatmap (warna teks otomatis kontras),
+    # bukan satu anotasi per sel
+    fig_corr = go.Figure()
+
+    fig_corr.add_trace(go.Heatmap(
+        z=corr.values,
+        x=corr.columns,
+        y=corr.index,
+        text=corr.values,
+        texttemplate="%{text:.2f}",
+        textfont=dict(size=12),
+        colorscale=[
+            [0.0, '#FDA19B'],
+            [0.2, '#E47A7B'],
+            [0.4, '#CB5D66'],
+            [0.6, '#B14454'],
+            [0.8, '#982E46'],
+            [1.0, '#660F2F']
+        ],
+        zmin=-1,
+        zmax=1,
+        hovertemplate="Variabel X=%{x}<br>Variabel Y=%{y}<br>Korelasi=%{z}<extra></extra>"
+    ))
+
+    return _layout_dasar(
+        fig_corr,
+        title=f"Heatmap Korelasi ({METODE_KORELASI[metode]}) dengan Nilai Korelasi",
+        height=700,
+        xaxis=dict(side="bottom")
+    )
+
+
+def _tabel_tren(tampilan, jendela):
+    tren = tampilan.get("tren")
+    return None if tren is None else tren(jendela)
+
+
+def fig_tren_respons(tampilan, jendela=7):
+    import plotly.graph_objects as go
+    # Satu titik per hari dari ember harian, bukan per responden
+    tabel = _tabel_tren(tampilan, jendela)
+    if tabel is None:
+        return None
+    rata_respons = tabel["respons"].rolling(jendela, min_periods=1).mean()
+
+    fig_respons = go.Figure()
+    fig_respons.add_trace(go.Bar(
+        x=tabel.index,
+        y=tabel["respons"],
+        name="Respons per hari",
+        marker_color="#E47A7B",
+        hovertemplate="%{x|%d %b %Y}<br>Respons=%{y}<extra></extra>"
+    ))
+    fig_respons.add_trace(go.Scatter(
+        x=tabel.index,
+        y=rata_respons,
+        name=f"Rata-rata {jendela} hari",
+        mode="lines",
+        line=dict(color="#660F2F", width=2),
+        hovertemplate="%{x|%d %b %Y}<br>Rata-rata=%{y:.1f}<extra></extra>"
+    ))
+    return _layout_dasar(
+        fig_respons,
+        title="Jumlah Respons per Hari",
+        xaxis_title="Tanggal",
+        yaxis_title="Jumlah Respons",
+        legend=dict(orientation="h", y=-0.25),
+        margin=dict(l=10, r=10, t=40, b=10)
+    )
+
+
+def fig_tren_ukuran(tampilan, jendela=7):
+    import plotly.graph_objects as go
+    # Skor (skala 1–5) di sumbu kiri, proporsi (%) di sumbu kanan
+    tabel = _tabel_tren(tampilan, jendela)
+    if tabel is None:
+        return None
+    warna = {"fomo_num": "#CB5D66", "kesejahteraan_score": "#660F2F", "proporsi_fomo_pct": "#E47A7B"}
+
+    fig_ukuran = go.Figure()
+    for kolom, label in UKURAN_TREN.items():
+        if f"{kolom}_bergulir" not in tabel.columns:
+            continue
+        persen = kolom == "proporsi_fomo_pct"
+        fig_ukuran.add_trace(go.Scatter(
+            x=tabel.index,
+            y=tabel[f"{kolom}_bergulir"],
+            name=label,
+            mode="lines+markers",
+            yaxis="y2" if persen else "y",
+            line=dict(color=warna[kolom], width=2, dash="dot" if persen else "solid"),
+            hovertemplate=f"%{{x|%d %b %Y}}<br>{label}=%{{y:.2f}}<extra></extra>"
+        ))
+    if not fig_ukuran.data:
+        return None
+    return _layout_dasar(
+        fig_ukuran,
+        title=f"Rata-rata Bergulir {jendela} Hari",
+        xaxis_title="Tanggal",
+        yaxis=dict(title="Skor (1–5)"),
+        yaxis2=dict(title="Proporsi FOMO (%)", overlaying="y", side="right", showgrid=False),
+        legend=dict(orientation="h", y=-0.25),
+        margin=dict(l=10, r=10, t=40, b=10)
+    )
+
+
+FIGURE_BUILDERS = {
+    "fakultas_bar": fig_fakultas_bar,
+    "fomo_pie": fig_fomo_pie,
+    "fomo_kesejahteraan_heatmap": fig_fomo_kesejahteraan_heatmap,
+    "fomo_kesejahteraan_bar": fig_fomo_kesejahteraan_bar,
+    "kemampuan_kesejahteraan_heatmap": fig_kemampuan_kesejahteraan_heatmap,
+    "kemampuan_kesejahteraan_bar": fig_kemampuan_kesejahteraan_bar,
+    "fomo_kemampuan_heatmap": fig_fomo_kemampuan_heatmap,
+    "fomo_kemampuan_bar": fig_fomo_kemampuan_bar,
+    "proporsi_pie": fig_proporsi_pie,
+    "proporsi_hist": fig_proporsi_hist,
+    "korelasi_heatmap": fig_korelasi_heatmap,
+    "tren_respons": fig_tren_respons,
+    "tren_ukuran": fig_tren_ukuran,
+}
@@ -0,0 +1,260 @@
+# laporan.py
+# Ekspor laporan statis (HTML + gambar opsional) tanpa server Streamlit
+#
+# Jalankan dari root repo:
+#   python laporan.py                                     # dataset default, semua responden
+#   python laporan.py a.csv b.csv --per-fakultas --out laporan --workers 4
+#   python laporan.py --gambar png pdf                    # butuh paket kaleido
+#   python laporan.py survei.db --per-fakultas            # sumber SQLite (analitik/basisdata.py)
+#
+# Setiap (dataset × subset fakultas) menjadi satu folder berisi index.html dengan isi
+# ketiga halaman dashboard; plotly.js ditulis sekali di root output sehingga laporan
+# bisa dibuka offline. Laporan dikerjakan paralel di ProcessPoolExecutor. Preprocessing,
+# kubus, builder grafik, dan teks insight sama persis dengan yang dipakai dashboard.
+
+import argparse
+import html
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from analitik.agregasi import KOLOM_FAKULTAS, frekuensi, iris
+from analitik.basisdata import baca_frame, hitung_sql, klausa_filter, meta_sqlite, pool_sqlite, ringkas_sql
+from grafik import FIGURE_BUILDERS, METODE_KORELASI
+from analitik.insight import nilai_kpi, susun_insight
+from analitik.korelasi import VARIABEL_KORELASI, correlation_matrices
+from analitik.muat import adalah_sqlite
+from analitik import DATA_PATH, load_df, source_fingerprint
+
+# Isi Halaman 2: (judul bagian, [(id grafik, parameter, kunci insight, label insight)])
+BAGIAN = [
+    ("Distribusi Responden & Proporsi FOMO", [
+        ("fakultas_bar", {}, "fakultas", "Insight"),
+        ("fomo_pie", {}, "fomo", "Insight"),
+    ]),
+    ("Pengaruh FOMO terhadap Kesejahteraan Psikologis", [
+        ("fomo_kesejahteraan_heatmap", {}, "fomo_kesejahteraan_heatmap", "Insight Heatmap"),
+        ("fomo_kesejahteraan_bar", {}, "fomo_kesejahteraan_bar", "Insight Bar"),
+    ]),
+    ("Pengaruh Kemampuan Mengelola Keuangan terhadap Kesejahteraan Psikologis", [
+        ("kemampuan_kesejahteraan_heatmap", {}, "kemampuan_kesejahteraan_heatmap", "Insight Heatmap"),
+        ("kemampuan_kesejahteraan_bar", {}, "kemampuan_kesejahteraan_bar", "Insight Bar"),
+    ]),
+    ("Hubungan antara FOMO dan Kemampuan Mengelola Keuangan", [
+        ("fomo_kemampuan_heatmap", {}, "fomo_kemampuan_heatmap", "Insight Heatmap"),
+        ("fomo_kemampuan_bar", {}, "fomo_kemampuan_bar", "Insight Bar"),
+    ]),
+    ("Proporsi Pengeluaran FOMO terhadap Uang Saku (%)", [
+        ("proporsi_pie", {}, "proporsi_pie", "Insight"),
+        ("proporsi_hist", {}, "proporsi_hist", "Insight"),
+    ]),
+    (f"Korelasi Antar Variabel Numerik ({METODE_KORELASI['pearson']})", [
+        ("korelasi_heatmap", {"metode": "pearson"}, ("korelasi", "pearson"), "Insight"),
+    ]),
+]
+
+CSS = """
+* { font-family: 'Times New Roman', Times, serif; }
+body { background: #FFF8F8; margin: 0 auto; max-width: 1280px; padding: 24px; color: #3B0A1A; }
+.judul { background: #7F1D3A; color: white; padding: 22px; border-radius: 10px; text-align: center; }
+.judul h1 { margin: 6px; }
+h2 { color: #660F2F; border-bottom: 2px solid #E47A7B; padding-bottom: 6px; margin-top: 40px; }
+.kpi-baris { display: grid; grid-template-columns: repeat(5, 1fr); gap: 14px; margin: 20px 0; }
+.kpi { background: linear-gradient(135deg, #FDA19B, #E47A7B, #CB5D66); border-radius: 16px;
+       padding: 20px; text-align: center; box-shadow: 0px 6px 15px rgba(203, 93, 102, 0.25); }
+.kpi .small { font-size: 15px; color: #5B1C26; }
+.kpi h3 { font-size: 24px; margin: 5px 0 0 0; color: #4A0D1A; }
+.grafik { display: grid; grid-template-columns: repeat(auto-fit, minmax(480px, 1fr)); gap: 18px; }
+.card { background: #FDA19B; color: #660F2F; padding: 14px; border-radius: 10px; margin-top: 10px; }
+.kesimpulan-card { background: linear-gradient(135deg, #FDA19B, #CB5D66, #982E46); border-radius: 16px;
+                   padding: 20px; margin-bottom: 20px; color: #330A1C; }
+.kesimpulan-card h3 { margin: 0 0 10px 0; color: #660F2F; }
+.footer { background: #660F2F; color: white; text-align: center; padding: 12px; border-radius: 10px; margin-top: 30px; }
+"""
+
+
+def slug(teks):
+    return re.sub(r"[^a-z0-9]+", "-", str(teks).lower()).strip("-") or "data"
+
+
+def _halaman_html(judul, ringkasan, insight, grafik_html, plotly_js):
+    # Teks insight sudah berupa HTML dengan label data yang di-escape (insight.py);
+    # teks lain yang disisipkan di sini di-escape langsung
+    kpi = {k: html.escape(v) for k, v in nilai_kpi(ringkasan).items()}
+    kartu_kpi = [
+        ("Jumlah responden", ringkasan["n"]),
+        ("Rata-rata uang saku", kpi["uang_saku"]),
+        ("Rata-rata pengeluaran FOMO", kpi["pengeluaran_fomo"]),
+        ("Rata-rata kemampuan keuangan", kpi["kemampuan"]),
+        ("Rata-rata kesejahteraan psikologis", kpi["kesejahteraan"]),
+    ]
+    bagian = []
+    for judul_bagian, isi in BAGIAN:
+        sel = []
+        for chart_id, _, kunci, label in isi:
+            if chart_id not in grafik_html:
+                continue
+            teks = insight[kunci[0]].get(kunci[1]) if isinstance(kunci, tuple) else insight[kunci]
+            kartu = f'<div class="card">💡 <b>{html.escape(label)}:</b> {teks}</div>' if teks else ""
+            sel.append(f"<div>{grafik_html[chart_id]}{kartu}</div>")
+        if sel:
+            bagian.append(f"<h3>{html.escape(judul_bagian)}</h3><div class='grafik'>{''.join(sel)}</div>")
+    kesimpulan = "".join(
+        f"<div class='kesimpulan-card'><h3>{html.escape(j)}</h3><p>{isi}</p></div>"
+        for j, isi in insight["kesimpulan"]
+    )
+    return f"""<!DOCTYPE html>
+<html lang="id"><head><meta charset="utf-8">
+<title>{html.escape(judul)}</title>
+<script src="{plotly_js}"></script>
+<style>{CSS}</style></head>
+<body>
+<div class="judul"><h1>Analisis Dampak FOMO dan Pengelolaan Keuangan terhadap Kesejahteraan Psikologis Mahasiswa</h1>
+<div>{html.escape(judul)}</div></div>
+
+<h2>Halaman 1 — Dataset & KPI</h2>
+<div class="kpi-baris">{"".join(f"<div class='kpi'><div class='small'>{html.escape(k)}</div><h3>{v}</h3></div>" for k, v in kartu_kpi)}</div>
+<div class="card" style="background:#FFF1F1;">Rata-rata uang saku mahasiswa adalah {kpi["uang_saku"]}, dengan
+pengeluaran FOMO rata-rata mencapai {kpi["proporsi"]} dari uang saku bulanan. Kemampuan keuangan berada pada skor
+<b>{kpi["kemampuan"]}</b> dan kesejahteraan psikologis pada skor rata-rata <b>{kpi["kesejahteraan"]}</b>.</div>
+
+<h2>Halaman 2 — Visualisasi Data</h2>
+{"".join(bagian)}
+
+<h2>Halaman 3 — Kesimpulan</h2>
+{kesimpulan}
+<div class="footer">Disusun oleh <b>Kelompok Threeasure</b> • UPN "Veteran" Jawa Timur</div>
+</body></html>
+"""
+
+
+def _data_sqlite(path, fakultas):
+    # Sumber SQLite: kubus dan jumlah jawaban FOMO dihitung di SQL untuk subset fakultas,
+    # dan hanya kolom per baris yang dipakai grafik laporan yang dibaca, sehingga setiap
+    # worker tidak memuat seluruh tabel. Hasilnya sudah subset, jadi mask tidak dipakai.
+    pool = pool_sqlite(path)
+    kolom = meta_sqlite(pool)["kolom"]
+    syarat = klausa_filter({} if fakultas is None else {"fakultas": (fakultas,)},
+                           {"fakultas": KOLOM_FAKULTAS})
+    df_work = baca_frame(pool, [kolom["fomo_text"], "fomo_num", "proporsi_fomo_pct", *VARIABEL_KORELASI], *syarat)
+    jawaban = hitung_sql(pool, kolom["fomo_text"], *syarat) if kolom["fomo_text"] in df_work.columns else None
+    return df_work, kolom, ringkas_sql(pool, *syarat), jawaban
+
+
+def buat_laporan(path, fakultas, out_dir, plotly_js, gambar=()):
+    """Tulis satu laporan (dataset, subset fakultas atau None = semua) ke out_dir."""
+    import plotly.io as pio
+
+    mulai = time.perf_counter()
+    if adalah_sqlite(path):
+        df_work, kolom, ringkasan, jawaban = _data_sqlite(path, fakultas)
+        mask = None
+    else:
+        df_work, kolom, ringkasan = load_df(source_fingerprint(path))
+        mask = None
+        if fakultas is not None:
+            mask = (df_work["fakultas_clean"] == fakultas).to_numpy()
+            # Fakultas adalah sumbu kubus: KPI & kontingensi subset cukup diiris
+            ringkasan = iris(ringkasan, fakultas=[fakultas])
+        jawaban = None
+        col_fomo = kolom["fomo_text"]
+        if col_fomo and col_fomo in df_work.columns:
+            s = df_work[col_fomo] if mask is None else df_work[col_fomo][mask]
+            jawaban = s.value_counts()
+    korelasi = correlation_matrices(df_work, mask=mask)
+    tampilan = {
+        "df_work": df_work,
+        "mask": mask,
+        "ringkasan": ringkasan,
+        "fomo_text": kolom["fomo_text"],
+        "korelasi": lambda: korelasi,
+    }
+
+    insight = susun_insight(ringkasan, jawaban, korelasi)
+
+    os.makedirs(out_dir, exist_ok=True)
+    grafik_html = {}
+    for _, isi in BAGIAN:
+        for chart_id, params, _, _ in isi:
+            fig = FIGURE_BUILDERS[chart_id](tampilan, **params)
+            if fig is None:
+                continue
+            grafik_html[chart_id] = pio.to_html(fig, full_html=False, include_plotlyjs=False)
+            for fmt in gambar:
+                fig.write_image(os.path.join(out_dir, f"{chart_id}.{fmt}"), format=fmt)
+
+    nama = os.path.basename(path) + ("" if fakultas is None else f" — {fakultas}")
+    js = os.path.relpath(plotly_js, out_dir)
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(_halaman_html(nama, ringkasan, insight, grafik_html, js))
+    return {"nama": nama, "n": ringkasan["n"], "dir": out_dir, "detik": time.perf_counter() - mulai}
+
+
+def _tulis_indeks(out, hasil):
+    baris = "".join(
+        f"<li><a href='{html.escape(os.path.relpath(h['dir'], out))}/index.html'>{html.escape(h['nama'])}</a>"
+        f" — {h['n']} responden</li>"
+        for h in sorted(hasil, key=lambda h: h["nama"])
+    )
+    with open(os.path.join(out, "index.html"), "w", encoding="utf-8") as f:
+        f.write(f"<!DOCTYPE html><html lang='id'><head><meta charset='utf-8'><title>Laporan Threeasure</title>"
+                f"<style>{CSS}</style></head><body><div class='judul'><h1>Laporan Threeasure</h1></div>"
+                f"<ul>{baris}</ul></body></html>")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ekspor laporan dashboard ke HTML statis")
+    parser.add_argument("data", nargs="*", default=[DATA_PATH], help="file CSV survei")
+    parser.add_argument("--out", default="laporan", help="folder output")
+    parser.add_argument("--per-fakultas", action="store_true", help="tambahkan satu laporan per fakultas")
+    parser.add_argument("--gambar", nargs="+", default=[], choices=["png", "svg", "pdf"],
+                        help="simpan juga setiap grafik sebagai gambar (butuh kaleido)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    if args.gambar:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            parser.error("ekspor gambar butuh paket kaleido (pip install kaleido)")
+
+    mulai = time.perf_counter()
+    os.makedirs(args.out, exist_ok=True)
+    plotly_js = os.path.join(args.out, "plotly.min.js")
+    if not os.path.exists(plotly_js):
+        from plotly.offline import get_plotlyjs
+        with open(plotly_js, "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+
+    # Preprocessing CSV sekali per dataset di proses utama (menulis cache Feather), sehingga
+    # worker cukup memuat cache itu dan tidak berebut mem-parse CSV yang sama. Untuk sumber
+    # SQLite daftar fakultas cukup satu GROUP BY; setiap worker membaca subsetnya sendiri.
+    jobs = []
+    for path in args.data:
+        if adalah_sqlite(path):
+            fak = hitung_sql(pool_sqlite(path), KOLOM_FAKULTAS).sort_index()
+        else:
+            fak = frekuensi(load_df(source_fingerprint(path))[2], "fakultas")
+        base = os.path.join(args.out, slug(os.path.splitext(os.path.basename(path))[0]))
+        jobs.append((path, None, os.path.join(base, "semua")))
+        if args.per_fakultas:
+            jobs += [(path, f, os.path.join(base, slug(f))) for f in fak.index[fak > 0]]
+
+    hasil, gagal = [], 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(buat_laporan, p, f, d, plotly_js, tuple(args.gambar)): (p, f) for p, f, d in jobs}
+        for fut in as_completed(futures):
+            try:
+                h = fut.result()
+            except Exception as e:
+                gagal += 1
+                print(f"[gagal] {futures[fut]}: {e}", file=sys.stderr)
+                continue
+            hasil.append(h)
+            print(f"[ok] {h['nama']}: {h['n']} responden, {h['detik']:.1f} s")
+
+    _tulis_indeks(args.out, hasil)
+    print(f"{len(hasil)} laporan di {args.out}/ dalam {time.perf_counter() - mulai:.1f} s")
+    sys.exit(1 if gagal else 0)
@@ -0,0 +1,8 @@
+# conftest.py
+# Jalankan dari root repo: python -m pytest tests
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
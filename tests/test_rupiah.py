@@ -0,0 +1,45 @@
+# test_rupiah.py
+# parse_rupiah: format nominal ekspor survei → float64
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analitik.rupiah import parse_rupiah
+
+
+@pytest.mark.parametrize("teks, nilai", [
+    ("2000000", 2_000_000.0),
+    ("2000000.0", 2_000_000.0),
+    ("Rp 1.500.000", 1_500_000.0),
+    ("Rp 1.500.000,50", 1_500_000.5),
+    ("rp. 750.000", 750_000.0),
+    ("1,500,000", 1_500_000.0),
+    ("1,500,000.25", 1_500_000.25),
+    ("1500000,5", 1_500_000.5),
+    ("  300000  ", 300_000.0),
+    ("-150000", -150_000.0),
+    ("-", np.nan),
+    ("", np.nan),
+    ("abc", np.nan),
+    (None, np.nan),
+])
+def test_parse_rupiah_teks(teks, nilai):
+    # Nilai lain di kolom yang sama memastikan jalur teks (bukan numerik) yang diuji
+    hasil = parse_rupiah(pd.Series([teks, "Rp 1"], dtype=object))
+    assert hasil.dtype == "float64"
+    assert hasil.iloc[0] == pytest.approx(nilai, nan_ok=True)
+    assert hasil.iloc[1] == 1.0
+
+
+def test_parse_rupiah_angka_apa_adanya():
+    # Kolom yang sudah dibaca read_csv sebagai float tidak di-parse ulang sebagai teks
+    s = pd.Series([2_000_000.0, np.nan, 1_500_000.5], index=[10, 11, 12])
+    hasil = parse_rupiah(s)
+    assert hasil.dtype == "float64"
+    pd.testing.assert_series_equal(hasil, s)
+
+
+def test_parse_rupiah_menjaga_index():
+    s = pd.Series(["Rp 1.000", "Rp 1.000", "-"], index=[5, 6, 7])
+    pd.testing.assert_series_equal(parse_rupiah(s), pd.Series([1000.0, 1000.0, np.nan], index=[5, 6, 7]))
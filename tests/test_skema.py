@@ -0,0 +1,70 @@
+# test_skema.py
+# resolve_kolom: pencocokan nama kolom ekspor → peran analitik
+
+import os
+
+import pandas as pd
+import pytest
+
+from analitik.muat import DATA_PATH
+from analitik.skema import KolomTidakDikenali, kolom_analitik, resolve_kolom
+
+CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), DATA_PATH)
+
+
+def test_token_utuh_x1_bukan_x10():
+    assert resolve_kolom(["x10", "x1"])["uang_saku"] == "x1"
+    assert resolve_kolom(["x10", "x2"])["uang_saku"] is None
+
+
+def test_token_utuh_emosi_bukan_emosional():
+    kolom = resolve_kolom(["kebutuhan_akan_dukungan_emosional"])
+    assert kolom["distress_1"] is None
+    assert resolve_kolom(["kebutuhan_akan_dukungan_emosional", "pengaruh_emosi"])["distress_1"] == "pengaruh_emosi"
+
+
+def test_nama_persis_menang():
+    # "uang" cocok dengan kedua kolom, tetapi kolom bernama persis "uang" dipilih tanpa ambigu
+    assert resolve_kolom(["uang_tambahan", "uang"])["uang_saku"] == "uang"
+
+
+def test_satu_kolom_satu_peran():
+    # Kolom frekuensi FOMO memuat token "pengeluaran", tetapi sudah diambil freq_fomo
+    kolom = resolve_kolom(["frekuensi_fomo_pengeluaran"])
+    assert kolom["freq_fomo"] == "frekuensi_fomo_pengeluaran"
+    assert kolom["pengeluaran_fomo"] is None
+    dipakai = [c for c in kolom.values() if c is not None]
+    assert len(dipakai) == len(set(dipakai))
+
+
+def test_header_ambigu_gagal():
+    with pytest.raises(KolomTidakDikenali, match="uang_saku"):
+        resolve_kolom(["uang_saku_bulanan", "uang_saku_mingguan"])
+    assert issubclass(KolomTidakDikenali, ValueError)
+
+
+def test_header_survei_bawaan():
+    header = pd.read_csv(CSV, nrows=0, usecols=kolom_analitik).columns
+    assert resolve_kolom(header) == {
+        "timestamp": "timestamp",
+        "fakultas": "fakultas",
+        "program_studi": "program_studi",
+        "fomo_text": "sering_merasa_fomo",
+        "freq_fomo": "frekuensi_fomo_pengeluaran",
+        "uang_saku": "rata-rata_uang_saku_perbulan",
+        "pengeluaran_fomo": "pengeluaran_untuk_fomo_per_bulan",
+        "kemampuan": "kemampuan_mengelola_keuangan",
+        "kesejahteraan_explicit": None,
+        "distress_1": "pengaruh_fomo_terhadap_emosi",
+        # "frekuensi_stres_karena_finansial" tidak memuat token "fin"
+        "distress_2": None,
+        "distress_3": "frekuensi_hilang_semangat_kuliah_karena_tekanan_finansial",
+        "distress_4": "frekuensi_stres_fomo",
+    }
+
+
+def test_hasil_adalah_salinan():
+    # Hasil di-cache per header; mengubah dict hasil tidak boleh mengubah cache
+    header = ["fakultas", "prodi"]
+    resolve_kolom(header)["fakultas"] = "lain"
+    assert resolve_kolom(header)["fakultas"] == "fakultas"
@@ -0,0 +1,22 @@
+# test_statistik.py
+# p-value χ² (gamma tak lengkap atas) dibandingkan dengan bentuk tertutupnya
+
+import math
+
+import pytest
+
+from analitik.statistik import p_chi_kuadrat
+
+STATISTIK = [0.0, 0.01, 0.5, 1.0, 3.84, 5.99, 10.0, 25.0, 80.0]
+
+
+@pytest.mark.parametrize("x", STATISTIK)
+def test_p_chi_kuadrat_df2(x):
+    # df = 2: p = exp(-x/2)
+    assert p_chi_kuadrat(x, 2) == pytest.approx(math.exp(-x / 2), rel=1e-9, abs=1e-300)
+
+
+@pytest.mark.parametrize("x", STATISTIK)
+def test_p_chi_kuadrat_df1(x):
+    # df = 1: p = erfc(√(x/2))
+    assert p_chi_kuadrat(x, 1) == pytest.approx(math.erfc(math.sqrt(x / 2)), rel=1e-9, abs=1e-300)